@@ -2,7 +2,7 @@
 """ API Module """
 
 
-from flask import Flask, jsonify, make_response  # type: ignore
+from flask import Flask, jsonify, make_response, request  # type: ignore
 from models import storage
 from api.v1.views import app_views
 from os import getenv
@@ -16,6 +16,14 @@ app.register_blueprint(app_views, url_prefix='/api/v1')
 CORS(app, resources={r"/*": {"origins": "0.0.0.0"}})
 
 
+@app.before_request
+def route_reads():
+    """Lets GET requests and place searches read from a read replica.
+    """
+    storage.read_from_replicas(request.method == "GET" or
+                               request.endpoint == "app_views.search_places")
+
+
 @app.teardown_appcontext
 def close_storage(exception):
     """Closes the storage session after every request.
@@ -2,12 +2,33 @@
 """ Blueprint """
 
 
-from flask import Blueprint
+from flask import Blueprint, Response, json, stream_with_context
 
 
 app_views = Blueprint('app_views', __name__)
 
 
+def json_list(objs, drop=()):
+    """returns a response streaming the JSON list of the dictionaries of
+    objs, without their keys in drop, one object at a time
+
+    objs is only iterated once the response is being sent, in an app
+    context of its own, so it must not have been started already.
+    """
+    def chunks():
+        """yields the JSON list piece by piece"""
+        separator = "["
+        for obj in objs:
+            obj_dict = obj.to_dict()
+            for key in drop:
+                obj_dict.pop(key, None)
+            yield separator + json.dumps(obj_dict)
+            separator = ","
+        yield ("[" if separator == "[" else "") + "]\n"
+    return Response(stream_with_context(chunks()),
+                    mimetype="application/json")
+
+
 from api.v1.views.index import *
 from api.v1.views.states import *
 from api.v1.views.cities import *
@@ -4,8 +4,9 @@
 
 from flask import jsonify, abort, request, make_response  # type: ignore
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_list
 from models.amenity import Amenity
+from models.place import Place
 
 
 @app_views.route('/amenities',
@@ -23,10 +24,20 @@ def get_amenities(amenity_id=None):
         else:
             return jsonify(obj.to_dict())
     else:
-        amenities_list = []
-        for key, value in storage.all(Amenity).items():
-            amenities_list.append(value.to_dict())
-        return jsonify(amenities_list)
+        return json_list(storage.iter(Amenity))
+
+
+@app_views.route('/amenities/<amenity_id>/places', strict_slashes=False,
+                 methods=['GET'])
+def get_places_of_amenity(amenity_id):
+    """retrieves the places offering an amenity from storage and
+    displays JSON representation to them.
+    """
+    obj = storage.get(Amenity, amenity_id)
+    if obj is None:
+        abort(404)
+    places = storage.query(Place).filter(amenity_ids__contains=amenity_id)
+    return json_list(places)
 
 
 @app_views.route('/amenities/<amenity_id>', strict_slashes=False,
@@ -4,7 +4,7 @@
 
 from flask import jsonify, abort, request, make_response  # type: ignore
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_list
 from models.state import State
 from models.city import City
 
@@ -18,11 +18,8 @@ def get_cities(state_id):
     obj = storage.get(State, state_id)
     if obj is None:
         abort(404)
-    city_list = []
-    for key, value in storage.all(City).items():
-        if value.state_id == state_id:
-            city_list.append(value.to_dict())
-    return jsonify(city_list)
+    cities = storage.query(City).filter(state_id=state_id)
+    return json_list(cities)
 
 
 @app_views.route('/cities/<city_id>', strict_slashes=False,
@@ -41,15 +38,15 @@ def get_city(city_id):
 @app_views.route('/cities/<city_id>', strict_slashes=False,
                  methods=['DELETE'])
 def delete_city(city_id):
-    """Deletes city object from storage and displays
+    """Deletes city object, with its places and
+    their reviews, from storage and displays
     an empty dictionary representation.
     """
     obj = storage.get(City, city_id)
     if obj is None:
         abort(404)
     else:
-        storage.delete(obj)
-        storage.save()
+        storage.cascade_delete(obj)
         return make_response(jsonify({}), 200)
 
 
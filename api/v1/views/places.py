@@ -4,16 +4,11 @@
 
 from flask import jsonify, abort, request, make_response  # type: ignore
 from models import storage
-from api.v1.views import app_views
-from models.state import State
-from models.amenity import Amenity
+from api.v1.views import app_views, json_list
 from models.city import City
 from models.place import Place
 from models.user import User
-from os import getenv
-
-
-storage_t = getenv("HBNB_TYPE_STORAGE")
+from models.engine.place_columns import fields
 
 
 @app_views.route('/cities/<city_id>/places', strict_slashes=False,
@@ -22,13 +17,11 @@ def get_places(city_id):
     """retrieves places object in a city from storage and
     displays JSON representation to it.
     """
-    if storage.get(City, city_id) is None:
+    city = storage.get(City, city_id)
+    if city is None:
         abort(404)
-    places_list = []
-    for key, value in storage.all(Place).items():
-        if value.city_id == city_id:
-            places_list.append(value.to_dict())
-    return jsonify(places_list)
+    places = storage.query(Place).filter(city_id=city_id)
+    return json_list(places)
 
 
 @app_views.route('/places/<place_id>', strict_slashes=False,
@@ -47,15 +40,15 @@ def get_place(place_id):
 @app_views.route('/places/<place_id>', strict_slashes=False,
                  methods=['DELETE'])
 def delete_place(place_id):
-    """Deletes place object from storage and displays
+    """Deletes place object, with its reviews, from
+    storage and displays
     an empty dictionary representation.
     """
     obj = storage.get(Place, place_id)
     if obj is None:
         abort(404)
     else:
-        storage.delete(obj)
-        storage.save()
+        storage.cascade_delete(obj)
         return make_response(jsonify({}), 200)
 
 
@@ -86,7 +79,10 @@ def create_place(city_id):
     setattr(new_place, 'city_id', city_id)
     storage.new(new_place)
     storage.save()
-    return make_response(jsonify(new_place.to_dict()), 201)
+    place_dict = new_place.to_dict()
+    if 'amenities' in place_dict:
+        del place_dict['amenities']
+    return make_response(jsonify(place_dict), 201)
 
 
 @app_views.route('/places/<place_id>',
@@ -108,14 +104,16 @@ def update_place(place_id):
         if key not in ignore:
             setattr(obj, key, value)
     storage.save()
-    return jsonify(obj.to_dict())
+    place_dict = obj.to_dict()
+    if 'amenities' in place_dict:
+        del place_dict['amenities']
+    return jsonify(place_dict)
 
 
 @app_views.route('/places_search', methods=['POST'], strict_slashes=False)
 def search_places():
     """Searches for places with given parameters
     """
-    result_pool = []
     try:
         search_param = request.get_json()
         if search_param is None:
@@ -123,46 +121,34 @@ def search_places():
     except Exception:
         abort(400, "Not a JSON")
 
-    if 'states' not in search_param and 'cities' not in search_param:
-        result_pool = storage.all(Place).values()
-
-    cities_id_pool = []
-    if 'states' in search_param:
-        if len(search_param['states']) != 0:
-            for state_id in search_param['states']:
-                state = storage.get(State, state_id)
-                if state is None:
-                    continue
-                for city in state.cities:
-                    cities_id_pool.append(city.id)
-    if 'cities' in search_param:
-        if len(search_param['cities']) != 0:
-            for city in search_param['cities']:
-                if city not in cities_id_pool:
-                    cities_id_pool.append(city)
-
-    for key, value in storage.all(Place).items():
-        if value.city_id in cities_id_pool and value not in result_pool:
-            result_pool.append(value)
-
-    result_filtered = list(result_pool)
-    if 'amenities' in search_param:
-        if len(search_param['amenities']) != 0:
-            for place in result_pool:
-                for am_id in search_param['amenities']:
-                    if storage_t == 'db':
-                        am = storage.get(Amenity, am_id)
-                        if am is None:
-                            continue
-                        if am not in place.amenities:
-                            result_filtered.remove(place)
-                            break
-                    else:
-                        if am_id not in place.amenity_ids:
-                            result_filtered.remove(place)
-                            break
-    result_filtered = [obj.to_dict() for obj in result_filtered]
-    for res_dict in result_filtered:
-        if 'amenities' in res_dict:
-            del res_dict['amenities']
-    return jsonify(result_filtered)
+    states = search_param.get('states') or []
+    cities = search_param.get('cities') or []
+    amenities = set(search_param.get('amenities') or [])
+    ranges = {}
+    for field in fields:
+        if field in search_param:
+            bounds = search_param[field]
+            if not isinstance(bounds, list) or len(bounds) != 2 or any(
+                    bound is not None and (isinstance(bound, bool) or
+                                           not isinstance(bound,
+                                                          (int, float)))
+                    for bound in bounds):
+                abort(400, "Not a range")
+            ranges[field] = tuple(bounds)
+
+    places = storage.query(Place)
+    if states or cities:
+        cities_id_pool = set(cities)
+        if states:
+            cities_id_pool.update(city.id for city in storage.query(
+                City).filter(state_id__in=states))
+        places = places.filter(city_id__in=cities_id_pool)
+    for field, (low, high) in ranges.items():
+        if low is not None:
+            places = places.filter(**{field + "__gte": low})
+        if high is not None:
+            places = places.filter(**{field + "__lte": high})
+    for amenity_id in amenities:
+        places = places.filter(amenity_ids__contains=amenity_id)
+
+    return json_list(places, drop=('amenities',))
@@ -4,13 +4,9 @@
 
 from flask import jsonify, abort, request, make_response  # type: ignore
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_list
 from models.place import Place
 from models.amenity import Amenity
-from os import getenv
-
-
-storage_t = getenv("HBNB_TYPE_STORAGE")
 
 
 @app_views.route('/places/<place_id>/amenities', strict_slashes=False,
@@ -22,15 +18,8 @@ def get_amenities_from_place(place_id):
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    if storage_t == "db":
-        amenities = place.amenities
-        am_list = [amenity.to_dict() for amenity in amenities]
-        return jsonify(am_list)
-    else:
-        amenities = place.amenity_ids
-        am_list = [storage.get(Amenity, amenity_id).to_dict()
-                   for amenity_id in amenities]
-        return jsonify(am_list)
+    amenities = storage.query(Amenity).filter(id__in=place.amenity_ids)
+    return json_list(amenities)
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -47,14 +36,9 @@ def delete_amenity_from_place(place_id, amenity_id):
     if amenity is None:
         abort(404)
 
-    if storage_t == "db":
-        if amenity not in place.amenities:
-            abort(404)
-        storage.delete(amenity)
-    else:
-        if amenity_id not in place.amenity_ids:
-            abort(404)
-        place.amenity_ids.remove(amenity_id)
+    if amenity_id not in place.amenity_ids:
+        abort(404)
+    storage.unlink(place, amenity)
     storage.save()
     return make_response(jsonify({}), 200)
 
@@ -72,15 +56,8 @@ def link_amenity(place_id, amenity_id):
     if amenity is None:
         abort(404)
 
-    if storage_t == "db":
-        if amenity not in place.amenities:
-            place.amenities.append(amenity)
-        else:
-            return make_response(jsonify(amenity.to_dict()), 200)
-    else:
-        if amenity_id not in place.amenity_ids:
-            place.amenity_ids.append(amenity_id)
-        else:
-            return make_response(jsonify(amenity.to_dict()), 200)
+    if amenity_id in place.amenity_ids:
+        return make_response(jsonify(amenity.to_dict()), 200)
+    storage.link(place, amenity)
     storage.save()
     return make_response(jsonify(amenity.to_dict()), 201)
@@ -4,7 +4,7 @@
 
 from flask import jsonify, abort, request, make_response  # type: ignore
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_list
 from models.place import Place
 from models.review import Review
 from models.user import User
@@ -19,11 +19,8 @@ def get_reviews(place_id):
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    review_list = []
-    for key, value in storage.all(Review).items():
-        if value.place_id == place_id:
-            review_list.append(value.to_dict())
-    return jsonify(review_list)
+    reviews = storage.query(Review).filter(place_id=place_id)
+    return json_list(reviews)
 
 
 @app_views.route('/reviews/<review_id>', strict_slashes=False,
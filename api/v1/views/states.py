@@ -4,7 +4,7 @@
 
 from flask import jsonify, abort, request, make_response
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_list
 from models.state import State
 
 
@@ -21,24 +21,21 @@ def get_states(state_id=None):
         else:
             return jsonify(obj.to_dict())
     else:
-        state_list = []
-        for key, value in storage.all(State).items():
-            state_list.append(value.to_dict())
-        return jsonify(state_list)
+        return json_list(storage.iter(State))
 
 
 @app_views.route('/states/<state_id>', strict_slashes=False,
                  methods=['DELETE'])
 def delete_state(state_id):
-    """Deletes state object from storage and displays
+    """Deletes state object, with its cities and
+    their places and reviews, from storage and displays
     an empty dictionary representation.
     """
     obj = storage.get(State, state_id)
     if obj is None:
         abort(404)
     else:
-        storage.delete(obj)
-        storage.save()
+        storage.cascade_delete(obj)
         return make_response(jsonify({}), 200)
 
 
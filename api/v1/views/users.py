@@ -4,7 +4,7 @@
 
 from flask import jsonify, abort, request, make_response  # type: ignore
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_list
 from models.user import User
 
 
@@ -23,24 +23,21 @@ def get_users(user_id=None):
         else:
             return jsonify(obj.to_dict())
     else:
-        users_list = []
-        for key, value in storage.all(User).items():
-            users_list.append(value.to_dict())
-        return jsonify(users_list)
+        return json_list(storage.iter(User))
 
 
 @app_views.route('/users/<user_id>', strict_slashes=False,
                  methods=['DELETE'])
 def delete_user(user_id):
-    """Deletes user object from storage and displays
+    """Deletes user object, with its places and
+    reviews, from storage and displays
     an empty dictionary representation.
     """
     obj = storage.get(User, user_id)
     if obj is None:
         abort(404)
     else:
-        storage.delete(obj)
-        storage.save()
+        storage.cascade_delete(obj)
         return make_response(jsonify({}), 200)
 
 
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Measures the memory taken by the models in the default and in the compact
+layout, per class
+
+Usage, from the root of the repository:
+    python3 -m benchmarks.model_memory [number of objects per class]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+import uuid
+from models.engine.compact_models import compact
+from models.engine.file_storage import classes, references
+
+# number of parents the objects of a class refer to, e.g. 50 states
+parents = 50
+
+
+def records(name, number):
+    """returns number records of class name encoded in JSON, referring to
+    a pool of parents"""
+    pool = [str(uuid.uuid4()) for i in range(parents)]
+    fields = {"name": "name", "text": "A review", "email": "a@b.c",
+              "description": "A place", "number_rooms": 3, "latitude": 1.5}
+    result = []
+    for i in range(number):
+        record = {"__class__": name, "id": str(uuid.uuid4()),
+                  "created_at": "2017-03-25T02:17:06.000000",
+                  "updated_at": "2017-03-25T02:17:06.000000"}
+        for attr in references.get(name, ()):
+            if attr == "amenity_ids":
+                record[attr] = [str(uuid.UUID(pool[i % parents]))]
+            else:
+                record[attr] = str(uuid.UUID(pool[i % parents]))
+        for attr, value in fields.items():
+            if hasattr(classes[name], attr):
+                record[attr] = value
+        result.append(json.dumps(record))
+    return result
+
+
+def measure(model, records):
+    """returns the bytes taken by each object of model built from
+    records, decoded one at a time as when the file is read"""
+    gc.collect()
+    tracemalloc.start()
+    objs = [model(**json.loads(record)) for record in records]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size / len(records)
+
+
+def main(number):
+    """prints the bytes per object of every class in both layouts"""
+    print("{:10} {:>9} {:>9} {:>7}".format("class", "default", "compact",
+                                           "saved"))
+    for name in sorted(classes):
+        if name == "BaseModel":
+            continue
+        sample = records(name, number)
+        default = measure(classes[name], sample)
+        small = measure(compact(classes[name], references.get(name, ())),
+                        sample)
+        print("{:10} {:9.0f} {:9.0f} {:6.0f}%".format(
+            name, default, small, 100 * (1 - small / default)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Measures how fast objects are built from the records of the file, with
+the constructor and with from_storage(), and how fast the file reloads
+
+Usage, from the root of the repository:
+    python3 -m benchmarks.reload_speed [number of objects]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+import models
+from models.engine.file_storage import FileStorage, classes
+
+names = ("City", "Place", "Review", "State", "User")
+
+
+def records(number):
+    """returns number records spread over a few classes"""
+    result = {}
+    for i in range(number):
+        name = names[i % len(names)]
+        record = {"__class__": name, "id": str(uuid.uuid4()),
+                  "created_at": "2017-03-25T02:17:06.000000",
+                  "updated_at": "2017-03-25T02:17:06.000000",
+                  "name": "name {}".format(i)}
+        if name == "User":
+            record["password"] = "5ebe2294ecd0e0f08eab7690d2a6ee69"
+        result[name + "." + record["id"]] = record
+    return result
+
+
+def timed(function):
+    """returns the seconds function took to run"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(number):
+    """prints the objects built per second each way"""
+    sample = list(records(number).values())
+    build = {"constructor": lambda: [
+                 classes[r["__class__"]](**r) for r in sample],
+             "from_storage": lambda: [
+                 classes[r["__class__"]].from_storage(r) for r in sample]}
+    for way, function in build.items():
+        seconds = timed(function)
+        print("{:13} {:10.0f} objects/s".format(way, number / seconds))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        with open(path, "w") as f:
+            json.dump(records(number), f)
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects = {}
+        seconds = timed(lambda: (models.storage.reload(),
+                                 models.storage.all()))
+        print("{:13} {:10.0f} objects/s".format("reload", number / seconds))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -77,9 +77,9 @@ class HBNBCommand(cmd.Cmd):
             return False
         if args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    print(models.storage.all()[key])
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
+                    print(obj)
                 else:
                     print("** no instance found **")
             else:
@@ -88,16 +88,16 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
 
     def do_destroy(self, arg):
-        """Deletes an instance based on the class and id"""
+        """Deletes an instance based on the class and id, with the
+        instances depending on it"""
         args = shlex.split(arg)
         if len(args) == 0:
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    models.storage.all().pop(key)
-                    models.storage.save()
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
+                    models.storage.cascade_delete(obj)
                 else:
                     print("** no instance found **")
             else:
@@ -108,19 +108,18 @@ class HBNBCommand(cmd.Cmd):
     def do_all(self, arg):
         """Prints string representations of instances"""
         args = shlex.split(arg)
-        obj_list = []
         if len(args) == 0:
-            obj_dict = models.storage.all()
+            objs = models.storage.iter()
         elif args[0] in classes:
-            obj_dict = models.storage.all(classes[args[0]])
+            objs = models.storage.iter(classes[args[0]])
         else:
             print("** class doesn't exist **")
             return False
-        for key in obj_dict:
-            obj_list.append(str(obj_dict[key]))
-        print("[", end="")
-        print(", ".join(obj_list), end="")
-        print("]")
+        separator = "["
+        for obj in objs:
+            print(separator + str(obj), end="")
+            separator = ", "
+        print(("[" if separator == "[" else "") + "]")
 
     def do_update(self, arg):
         """Update an instance based on the class name, id, attribute & value"""
@@ -132,8 +131,8 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                k = args[0] + "." + args[1]
-                if k in models.storage.all():
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
                     if len(args) > 2:
                         if len(args) > 3:
                             if args[0] == "Place":
@@ -147,8 +146,8 @@ class HBNBCommand(cmd.Cmd):
                                         args[3] = float(args[3])
                                     except:
                                         args[3] = 0.0
-                            setattr(models.storage.all()[k], args[2], args[3])
-                            models.storage.all()[k].save()
+                            setattr(obj, args[2], args[3])
+                            obj.save()
                         else:
                             print("** value missing **")
                     else:
@@ -160,5 +159,19 @@ class HBNBCommand(cmd.Cmd):
         else:
             print("** class doesn't exist **")
 
+    def do_convert(self, arg):
+        """Rewrites the storage file with another codec (json, binary,
+        gzip or lzma)"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** codec name missing **")
+        elif getattr(models.storage, "convert", None) is None:
+            print("** storage can't be converted **")
+        else:
+            try:
+                models.storage.convert(args[0])
+            except ValueError:
+                print("** unknown codec **")
+
 if __name__ == '__main__':
     HBNBCommand().cmdloop()
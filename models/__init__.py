@@ -6,11 +6,22 @@ initialize the models package
 from os import getenv
 
 
-storage_t = getenv("HBNB_TYPE_STORAGE")
+storage_engine = getenv("HBNB_TYPE_STORAGE")
+# the models are mapped to tables for every SQL engine
+storage_t = "db" if storage_engine in ("db", "sqlite") else storage_engine
 
-if storage_t == "db":
+if storage_engine == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
+elif storage_engine == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "wal":
+    from models.engine.wal_storage import WALStorage
+    storage = WALStorage()
+elif storage_t == "segment":
+    from models.engine.segment_storage import SegmentStorage
+    storage = SegmentStorage()
 else:
     from models.engine.file_storage import FileStorage
     storage = FileStorage()
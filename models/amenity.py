@@ -19,3 +19,10 @@ class Amenity(BaseModel, Base):
     def __init__(self, *args, **kwargs):
         """initializes Amenity"""
         super().__init__(*args, **kwargs)
+
+    if models.storage_t != 'db':
+        @property
+        def place_amenities(self):
+            """getter for list of place instances offering the amenity"""
+            from models.place import Place
+            return models.storage.children(Place, "amenity_ids", self.id)
@@ -3,6 +3,7 @@
 Contains class BaseModel
 """
 
+from collections import OrderedDict
 from datetime import datetime
 import models
 from os import getenv
@@ -10,8 +11,35 @@ import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
+import weakref
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# the (weak reference, dictionary) of the HBNB_SERIALIZED_CACHE instances
+# most recently serialized, by id(), least recently used first, until one
+# of their attributes is written
+serialized = OrderedDict()
+serialized_size = int(getenv("HBNB_SERIALIZED_CACHE", "10000"))
+
+
+def recall(obj):
+    """returns the dictionary kept for obj or None"""
+    try:
+        ref, new_dict = serialized[id(obj)]
+        serialized.move_to_end(id(obj))
+    except KeyError:
+        return None
+    return new_dict if ref() is obj else None
+
+
+def remember(obj, new_dict):
+    """keeps new_dict as the dictionary of obj, forgetting the least
+    recently used ones beyond HBNB_SERIALIZED_CACHE"""
+    serialized[id(obj)] = (weakref.ref(obj), new_dict)
+    while len(serialized) > serialized_size:
+        try:
+            serialized.popitem(last=False)
+        except KeyError:
+            break
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -21,6 +49,8 @@ else:
 
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
+    # boolean - whether to_dict() keeps the dictionary of the instance
+    _serialize_once = True
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
@@ -47,10 +77,48 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    @classmethod
+    def from_storage(cls, record):
+        """returns the instance saved as the dictionary record
+
+        Unlike cls(**record), __init__ is not run: the attributes are set
+        at once, as they were saved, and the instance is not flagged as
+        changed. Timestamps are parsed with datetime.fromisoformat.
+        """
+        attrs = dict(record)
+        attrs.pop("__class__", None)
+        for name in ("created_at", "updated_at"):
+            value = attrs.get(name)
+            if value and type(value) is str:
+                attrs[name] = datetime.fromisoformat(value)
+            else:
+                attrs[name] = datetime.utcnow()
+        if attrs.get("id") is None:
+            attrs["id"] = str(uuid.uuid4())
+        obj = cls.__new__(cls)
+        obj._restore(attrs)
+        return obj
+
+    def _restore(self, attrs):
+        """sets the attributes attrs without flagging the instance as
+        changed"""
+        self.__dict__.update(attrs)
+
+    def __setattr__(self, name, value):
+        """sets an attribute and flags the instance as changed in storage"""
+        super().__setattr__(name, value)
+        serialized.pop(id(self), None)
+        models.storage.mark_dirty(self, name)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
-                                         self.__dict__)
+                                         self._attributes())
+
+    def _attributes(self):
+        """returns the {name: value} dict of the attributes of the
+        instance"""
+        return self.__dict__.copy()
 
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
@@ -59,18 +127,28 @@ class BaseModel:
         models.storage.save()
 
     def to_dict(self, fs=False):
-        """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
+        """returns a dictionary containing all keys/values of the instance
+
+        In file mode, the dictionary is kept until an attribute of the
+        instance is written, so an unchanged instance is serialized once;
+        every call returns a copy of it. Only the HBNB_SERIALIZED_CACHE
+        most recently serialized instances keep theirs, and none of the
+        compact layout, which would lose its memory savings.
+        """
+        new_dict = recall(self)
+        if new_dict is None:
+            new_dict = self._attributes()
+            for stamp in ("created_at", "updated_at"):
+                if type(new_dict.get(stamp)) is datetime:
+                    new_dict[stamp] = new_dict[stamp].isoformat(
+                        timespec="microseconds")
+            new_dict["__class__"] = self.__class__.__name__
+            new_dict.pop("_sa_instance_state", None)
+            if models.storage_t != "db" and self._serialize_once:
+                remember(self, new_dict)
+        new_dict = dict(new_dict)
         if fs is False:
-            if "password" in new_dict:
-                del new_dict["password"]
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
+            new_dict.pop("password", None)
         return new_dict
 
     def delete(self):
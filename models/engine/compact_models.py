@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+Contains the compact layout FileStorage can build models with
+"""
+
+from datetime import datetime, timedelta
+import sys
+import uuid
+
+# the naive UTC datetime timestamps are counted from
+epoch = datetime(1970, 1, 1)
+# the compact twin of every model class, by class
+twins = {}
+
+
+class Compact:
+    """stores the attributes of a model in slots, in a compact form
+
+    Ids in the canonical UUID form are kept as their 16 bytes and
+    timestamps as integer microseconds since the epoch; both are turned
+    back into a string and a datetime when read. Foreign key strings are
+    interned, so the many objects pointing at one parent share it.
+    Attributes not known to the class still go in the instance dict.
+    """
+
+    __slots__ = ()
+    # boolean - whether to_dict() keeps the dictionary of the instance; a
+    # copy of every attribute would outweigh the slots
+    _serialize_once = False
+
+    def __getattr__(self, name):
+        """returns the class default of an attribute not set yet"""
+        try:
+            return type(self)._defaults[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        """sets an attribute, interning the ids it refers to"""
+        super().__setattr__(name, self.__intern(name, value))
+
+    def _restore(self, attrs):
+        """sets the attributes attrs without flagging the instance as
+        changed"""
+        for name, value in attrs.items():
+            object.__setattr__(self, name, self.__intern(name, value))
+
+    def __intern(self, name, value):
+        """returns value interned if attribute name refers to ids"""
+        if name in self._interned:
+            if type(value) is str:
+                return sys.intern(value)
+            if type(value) is list:
+                return [sys.intern(item) if type(item) is str else item
+                        for item in value]
+        return value
+
+    @property
+    def id(self):
+        """getter for the id, as a string"""
+        value = self._id
+        if type(value) is bytes:
+            return str(uuid.UUID(bytes=value))
+        return value
+
+    @id.setter
+    def id(self, value):
+        """setter for the id, packed if it is a canonical UUID"""
+        try:
+            if str(uuid.UUID(value)) == value:
+                value = uuid.UUID(value).bytes
+        except (TypeError, ValueError, AttributeError):
+            pass
+        self._id = value
+
+    @property
+    def created_at(self):
+        """getter for the creation time, as a datetime"""
+        return unpack_time(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value):
+        """setter for the creation time, packed if it is a datetime"""
+        self._created_at = pack_time(value)
+
+    @property
+    def updated_at(self):
+        """getter for the last update time, as a datetime"""
+        return unpack_time(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        """setter for the last update time, packed if it is a datetime"""
+        self._updated_at = pack_time(value)
+
+    def _attributes(self):
+        """returns the {name: value} dict of the attributes of the
+        instance"""
+        attrs = {}
+        for name, slot in self._slots:
+            try:
+                slot.__get__(self)
+            except AttributeError:
+                continue
+            attrs[name] = getattr(self, name)
+        attrs.update(self.__dict__)
+        return attrs
+
+
+def pack_time(value):
+    """returns the datetime value as microseconds since the epoch, any
+    other value as is"""
+    if type(value) is datetime:
+        return (value - epoch) // timedelta(microseconds=1)
+    return value
+
+
+def unpack_time(value):
+    """returns the microseconds since the epoch value as a datetime, any
+    other value as is"""
+    if type(value) is int:
+        return epoch + timedelta(microseconds=value)
+    return value
+
+
+def compact(cls, interned=()):
+    """returns the compact twin of the model class cls, a subclass
+    keeping its attributes in slots and interning the attributes
+    interned"""
+    twin = twins.get(cls)
+    if twin is not None:
+        return twin
+    defaults = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if not name.startswith("_") and not callable(value) and \
+               not isinstance(value, (property, classmethod, staticmethod)):
+                defaults[name] = value
+    stored = {"id": "_id", "created_at": "_created_at",
+              "updated_at": "_updated_at"}
+    stored.update((name, name) for name in defaults)
+    twin = type(cls.__name__, (Compact, cls), {
+        "__slots__": tuple(stored.values()),
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        "__doc__": cls.__doc__,
+        "_defaults": defaults,
+        "_interned": frozenset(interned)})
+    twin._slots = tuple((name, vars(twin)[slot])
+                        for name, slot in stored.items())
+    twins[cls] = twin
+    return twin
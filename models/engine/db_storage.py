@@ -3,6 +3,8 @@
 Contains the class DBStorage
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
@@ -13,32 +15,117 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
+import threading
+import time
+from models.engine.query import Query
+from models.engine.replicas import Replicas, RoutingSession
+from models.engine.row_cache import RowCache
+from sqlalchemy import bindparam, create_engine, delete, event, func
+from sqlalchemy import select, text, update
+from sqlalchemy.orm import attributes, make_transient_to_detached
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm.util import identity_key
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# number of ids a bulk statement filters on at most
+batch_size = 500
+# number of rows fetched at a time when results are streamed
+yield_size = 1000
+# the SQL form of the comparisons of Query.filter() on a column
+comparisons = {"eq": lambda column, value: column == value,
+               "ne": lambda column, value: column != value,
+               "lt": lambda column, value: column < value,
+               "lte": lambda column, value: column <= value,
+               "gt": lambda column, value: column > value,
+               "gte": lambda column, value: column >= value,
+               "in": lambda column, values: column.in_(list(values))}
 
 
 class DBStorage:
-    """interaacts with the MySQL database"""
+    """interaacts with the MySQL database
+
+    get() looks an id up in the identity map of the session, then in a
+    cache of the HBNB_DB_CACHE (1024 by default, 0 for none) rows last
+    read by the process, and only then asks the database for it by
+    primary key. Rows are evicted from the cache when a commit of this
+    process changes or deletes them, and are kept HBNB_DB_CACHE_AGE
+    seconds (5 by default) at most, so writes by other processes are
+    seen after that long.
+
+    HBNB_DB_REPLICAS lists, comma separated, the URLs of read replicas.
+    A thread that called read_from_replicas() reads from one of them,
+    unless its session has written or this process committed within
+    the last HBNB_DB_STICKY seconds (5 by default), so that a write is
+    read back from the primary until the replicas have it. Replicas
+    that cannot be reached are skipped, checked again every
+    HBNB_DB_HEALTH_INTERVAL seconds (5 by default), and reads fall back
+    to the primary when none is left.
+    """
     __engine = None
     __session = None
+    __deleter = None
+    # tuple - (monotonic time, {class name: count}) of the last counts
+    __counted = (float("-inf"), {})
+    # float - monotonic time of the last commit writing to the database
+    __written = float("-inf")
 
     def __init__(self):
         """Instantiate a DBStorage object"""
+        HBNB_ENV = getenv('HBNB_ENV')
+        self.__engine = self._connect()
+        # RowCache - detached copies of the rows last read, by key
+        self.__cache = RowCache(int(getenv('HBNB_DB_CACHE', '1024')),
+                                float(getenv('HBNB_DB_CACHE_AGE', '5')))
+        # Replicas - engines of the read replicas, None if there are none
+        self.__replicas = None
+        urls = [url.strip() for url in getenv('HBNB_DB_REPLICAS', '')
+                .split(',') if url.strip()]
+        if urls:
+            self.__replicas = Replicas(
+                [self._engine(url) for url in urls],
+                float(getenv('HBNB_DB_HEALTH_INTERVAL', '5')))
+        # float - seconds reads stay on the primary after a commit
+        self.__sticky = float(getenv('HBNB_DB_STICKY', '5'))
+        # threading.local - whether each thread may read from replicas
+        self.__reading = threading.local()
+        if HBNB_ENV == "test":
+            Base.metadata.drop_all(self.__engine)
+
+    def _connect(self):
+        """returns the engine of the MySQL database set by HBNB_MYSQL_*"""
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
-        HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
-        if HBNB_ENV == "test":
-            Base.metadata.drop_all(self.__engine)
+        return self._engine('mysql+mysqldb://{}:{}@{}/{}'.
+                            format(HBNB_MYSQL_USER,
+                                   HBNB_MYSQL_PWD,
+                                   HBNB_MYSQL_HOST,
+                                   HBNB_MYSQL_DB))
+
+    def _engine(self, url):
+        """returns the engine of the database at url"""
+        return create_engine(url)
+
+    def read_from_replicas(self, enabled=True):
+        """lets the reads of the calling thread go to a read replica, or
+        no longer with enabled False, e.g. for each request served"""
+        self.__reading.enabled = enabled
+
+    def __route(self, session):
+        """returns the engine of the replica session reads from, None
+        for the primary"""
+        if self.__replicas is None or \
+           not getattr(self.__reading, "enabled", False) or \
+           session.info.get("changed") or \
+           time.monotonic() - self.__written < self.__sticky:
+            return None
+        engine = session.info.get("replica")
+        if engine is None or not self.__replicas.healthy(engine):
+            engine = self.__replicas.pick()
+            session.info["replica"] = engine
+        return engine
 
     def all(self, cls=None):
         """query on the current database session"""
@@ -51,6 +138,19 @@ class DBStorage:
                     new_dict[key] = obj
         return (new_dict)
 
+    def iter(self, cls=None, batch_size=yield_size):
+        """yields the objects, of class cls if given, fetching batch_size
+        rows at a time through a server-side cursor
+
+        Only the current batch is held in memory, so nothing else should
+        be committed on the session until the iteration is over.
+        """
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                yield from self.__session.scalars(
+                    select(classes[clss]),
+                    execution_options={"yield_per": batch_size})
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
@@ -59,15 +159,113 @@ class DBStorage:
         """commit all changes of the current database session"""
         self.__session.commit()
 
+    def flush(self):
+        """commit all changes of the current database session
+
+        Saves are never deferred here: the session belongs to the calling
+        thread, so there is nothing left for a background writer to do.
+        """
+        self.__session.commit()
+
+    def mark_dirty(self, obj, name=None):
+        """does nothing, the session tracks changed objects by itself"""
+        pass
+
+    def dirty(self):
+        """returns the keys of the objects created, changed or deleted in
+        the current session and not committed yet"""
+        session = self.__session
+        return frozenset(obj.__class__.__name__ + '.' + obj.id
+                         for objs in (session.new, session.dirty,
+                                      session.deleted)
+                         for obj in objs)
+
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
 
+    def cascade_delete(self, obj, background=False):
+        """deletes obj and, through the ON DELETE CASCADE rule of the
+        foreign keys, every row depending on it, then commits
+
+        With background, the deletion runs in a worker thread with a
+        session of its own and a Future is returned.
+        """
+        if background:
+            if self.__deleter is None:
+                self.__deleter = ThreadPoolExecutor(1)
+            return self.__deleter.submit(self.__cascade_delete, type(obj),
+                                         obj.id)
+        self.__session.delete(obj)
+        self.__session.commit()
+        # the rows deleted by the database never went through the session
+        self.__forget()
+
+    def __cascade_delete(self, cls, id):
+        """deletes the row of class cls with id from a worker thread"""
+        try:
+            obj = self.__session.get(cls, id)
+            if obj is not None:
+                self.cascade_delete(obj)
+        finally:
+            self.__session.remove()
+
+    def bulk_new(self, objs):
+        """adds every object of objs and commits them together
+
+        The session sends the rows of each table in batched INSERTs.
+        """
+        self.__session.add_all(objs)
+        self.__session.commit()
+
+    def bulk_delete(self, objs):
+        """deletes every object of objs with one DELETE per table and
+        batch of ids, and commits"""
+        ids = {}
+        for obj in objs:
+            ids.setdefault(type(obj), []).append(obj.id)
+        for cls, cls_ids in ids.items():
+            for batch in self.__batches(cls_ids):
+                self.__session.execute(delete(cls).where(cls.id.in_(batch)))
+        self.__session.commit()
+        self.__forget(self.__key(cls, id)
+                      for cls, cls_ids in ids.items() for id in cls_ids)
+
+    def bulk_update(self, cls, ids, changes):
+        """sets the columns changes: {name: value} of the rows of class
+        cls whose id is in ids with one UPDATE per batch of ids, commits
+        and returns how many rows were found
+
+        The id and timestamps are left out of changes; updated_at is set
+        to the same time on every row.
+        """
+        cls = classes.get(cls, cls)
+        values = {name: value for name, value in changes.items()
+                  if name in cls.__table__.columns and
+                  name not in ("id", "created_at", "updated_at")}
+        values["updated_at"] = datetime.utcnow()
+        found = 0
+        for batch in self.__batches(list(ids)):
+            found += self.__session.execute(
+                update(cls).where(cls.id.in_(batch)).values(values)).rowcount
+        self.__session.commit()
+        self.__forget(self.__key(cls, id) for id in ids)
+        return found
+
+    def __batches(self, ids):
+        """yields ids in lists of at most batch_size"""
+        for start in range(0, len(ids), batch_size):
+            yield ids[start:start + batch_size]
+
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    class_=RoutingSession, route=self.__route)
+        event.listen(sess_factory, "after_flush", self.__flushed)
+        event.listen(sess_factory, "after_commit", self.__committed)
+        event.listen(sess_factory, "after_rollback", self.__committed)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
@@ -75,23 +273,213 @@ class DBStorage:
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
+    def __flushed(self, session, context):
+        """notes the keys of the rows a flush of session wrote"""
+        changed = session.info.setdefault("changed", set())
+        changed.update(self.__key(type(obj), obj.id)
+                       for objs in (session.new, session.dirty,
+                                    session.deleted)
+                       for obj in objs)
+
+    def __committed(self, session):
+        """evicts the rows changed by the transaction session ended"""
+        changed = session.info.pop("changed", None)
+        if changed:
+            self.__forget(changed)
+
+    def __forget(self, keys=None):
+        """notes that the rows under keys, or any row when None, were
+        just written: they are evicted from the cache and reads stay on
+        the primary for a while"""
+        self.__written = time.monotonic()
+        if keys is None:
+            self.__cache.clear()
+        else:
+            self.__cache.evict(keys)
+
+    def __key(self, cls, id):
+        """returns the key of the row of class cls with id"""
+        return "{}.{}".format(cls.__name__, id)
+
+    def __model(self, cls):
+        """returns the mapped class cls is or names, None if it is neither,
+        e.g. for BaseModel"""
+        cls = classes.get(cls, cls)
+        return cls if cls in classes.values() else None
+
+    def __known(self, cls, id):
+        """returns the object of class cls with id from the session or
+        the cache, without going to the database, None if it is in
+        neither; rows the session wrote are not taken from the cache"""
+        obj = self.__session.identity_map.get(identity_key(cls, id))
+        if obj is None:
+            key = self.__key(cls, id)
+            if key in self.__session.info.get("changed", ()):
+                return None
+            row = self.__cache.get(key)
+            if row is not None:
+                obj = self.__session.merge(row, load=False)
+        return obj
+
+    def __remember(self, obj, generation):
+        """caches a detached copy of the columns of obj, read from the
+        database at the cache generation, unless the transaction of the
+        session wrote it and did not commit yet"""
+        key = self.__key(type(obj), obj.id)
+        if key in self.__session.info.get("changed", ()):
+            return
+        mapper = sqlalchemy.inspect(obj).mapper
+        row = mapper.class_manager.new_instance()
+        for column in mapper.column_attrs:
+            attributes.set_committed_value(row, column.key,
+                                           getattr(obj, column.key))
+        make_transient_to_detached(row)
+        self.__cache.put(key, row, generation)
+
     def get(self, cls, id):
         """retrieves an object with a given class and id and returns it
         returns None if object not found.
         """
-        objects_dict = self.all(cls)
-        search_key = "{}.{}".format(cls.__name__, id)
-        for key, value in objects_dict.items():
-            if key == search_key:
-                return value
-        return None
+        cls = self.__model(cls)
+        if cls is None or id is None:
+            return None
+        obj = self.__known(cls, id)
+        if obj is None:
+            generation = self.__cache.generation
+            obj = self.__session.get(cls, id)
+            if obj is not None:
+                self.__remember(obj, generation)
+        if obj is not None and obj in self.__session.deleted:
+            return None
+        return obj
+
+    def get_many(self, cls, ids):
+        """returns the {id: object} dict of the objects of class cls whose
+        id is in ids, reading those not in the session or the cache with
+        one SELECT per batch of ids"""
+        cls = self.__model(cls)
+        found = {}
+        if cls is None:
+            return found
+        missing = []
+        deleted = self.__session.deleted
+        for id in dict.fromkeys(ids):
+            obj = self.__known(cls, id)
+            if obj is None:
+                missing.append(id)
+            elif obj not in deleted:
+                found[id] = obj
+        generation = self.__cache.generation
+        for batch in self.__batches(missing):
+            for obj in self.__session.query(cls).filter(cls.id.in_(batch)):
+                found[obj.id] = obj
+                self.__remember(obj, generation)
+        return found
+
+    def link(self, place, amenity):
+        """associates amenity with place in the current session"""
+        if amenity not in place.amenities:
+            place.amenities.append(amenity)
+
+    def unlink(self, place, amenity):
+        """dissociates amenity from place in the current session"""
+        if amenity in place.amenities:
+            place.amenities.remove(amenity)
+
+    def children(self, cls, attr, id):
+        """returns the objects of class cls whose column attr is id"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        return self.__session.query(cls).filter(
+            getattr(cls, attr) == id).all()
+
+    def find_places(self, city_ids=None, ranges=None):
+        """returns the places in one of city_ids, when given, whose numeric
+        columns are within ranges: {column: (low, high)}"""
+        query = self.__session.query(Place)
+        if city_ids is not None:
+            query = query.filter(Place.city_id.in_(list(city_ids)))
+        for field, (low, high) in (ranges or {}).items():
+            column = getattr(Place, field)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        return query.all()
+
+    def query(self, cls):
+        """returns a Query on the objects of class cls"""
+        return Query(self, cls)
+
+    def select(self, query):
+        """returns an iterator over the rows query asks for, selected,
+        ordered and limited by the database and streamed yield_size rows
+        at a time"""
+        cls = classes[query.name]
+        sql = select(cls)
+        for attr, op, value in query.conditions:
+            if cls is Place and attr == "amenity_ids" and op == "contains":
+                sql = sql.where(cls.amenities.any(Amenity.id == value))
+            elif attr in cls.__table__.columns and op in comparisons:
+                sql = sql.where(comparisons[op](getattr(cls, attr), value))
+            else:
+                raise ValueError("can't filter {} on {}__{}".format(
+                    query.name, attr, op))
+        for attr, descending in query.ordering:
+            if attr not in cls.__table__.columns:
+                raise ValueError("can't order {} by {}".format(
+                    query.name, attr))
+            column = getattr(cls, attr)
+            sql = sql.order_by(column.desc() if descending else column)
+        if query.size is not None:
+            sql = sql.limit(query.size)
+        return iter(self.__session.scalars(
+            sql, execution_options={"yield_per": yield_size}))
 
     def count(self, cls=None):
         """Counts the number of objects in storage matching a given cls
         if no class if passed, counts everything in storage.
         """
-        count = 0
-        objects_dict = self.all(cls)
-        for object in objects_dict:
-            count += 1
-        return count
+        if cls is None:
+            return sum(self.counts().values())
+        cls = self.__model(cls)
+        if cls is None:
+            return 0
+        return self.__session.execute(
+            select(func.count()).select_from(cls)).scalar()
+
+    def counts(self, max_age=0):
+        """returns the {class name: count} dict of every class, counted
+        by the database in one query
+
+        With max_age, the counts may be up to max_age seconds old: the
+        estimates of _estimates() are used when the database keeps some,
+        and the counts are read again at most once every max_age seconds.
+        """
+        if max_age > 0:
+            counted, counts = self.__counted
+            if time.monotonic() - counted < max_age:
+                return dict(counts)
+            counts = self._estimates()
+        else:
+            counts = None
+        if counts is None:
+            counts = dict(self.__session.execute(select(*(
+                select(func.count()).select_from(cls).scalar_subquery()
+                .label(name) for name, cls in classes.items()))).one()
+                ._mapping)
+        self.__counted = (time.monotonic(), counts)
+        return dict(counts)
+
+    def _estimates(self):
+        """returns the {class name: count} dict of every class estimated
+        by InnoDB from its table statistics, None if there are none"""
+        tables = {cls.__tablename__: name for name, cls in classes.items()}
+        rows = self.__session.execute(text(
+            "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN :tables")
+            .bindparams(bindparam("tables", expanding=True)),
+            {"tables": list(tables)}).all()
+        if len(rows) != len(tables) or any(r[1] is None for r in rows):
+            return None
+        return {tables[table]: count for table, count in rows}
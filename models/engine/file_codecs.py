@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Contains the codecs FileStorage can write its file with
+"""
+
+import gzip
+import json
+import lzma
+import marshal
+
+
+class JSONCodec:
+    """the JSON format: one object holding every record by key"""
+
+    name = "json"
+
+    def encode(self, record):
+        """returns the encoded fragment of one record"""
+        return json.dumps(record)
+
+    def join(self, fragments):
+        """returns the file content holding the fragments {key: fragment}"""
+        return ("{" + ", ".join(json.dumps(key) + ": " + fragment
+                                for key, fragment in fragments.items()) +
+                "}").encode()
+
+    def decode(self, data):
+        """returns the {key: record} dict held by the file content data"""
+        return json.loads(data)
+
+    def matches(self, data):
+        """returns True if data was written by this codec"""
+        return data[:1] == b"{"
+
+
+class BinaryCodec:
+    """a compact binary format: a magic followed by a marshal dict
+
+    Records are marshaled with version 2 of the format, which has no
+    back references, so the fragments can be joined into the marshal
+    representation of the whole dict without encoding it again.
+    """
+
+    name = "binary"
+    magic = b"HBNB\x02"
+
+    def encode(self, record):
+        """returns the encoded fragment of one record"""
+        return marshal.dumps(record, 2)
+
+    def join(self, fragments):
+        """returns the file content holding the fragments {key: fragment}"""
+        return self.magic + b"{" + b"".join(
+            marshal.dumps(key, 2) + fragment
+            for key, fragment in fragments.items()) + b"0"
+
+    def decode(self, data):
+        """returns the {key: record} dict held by the file content data"""
+        return marshal.loads(data[len(self.magic):])
+
+    def matches(self, data):
+        """returns True if data was written by this codec"""
+        return data.startswith(self.magic)
+
+
+class GzipCodec(JSONCodec):
+    """the JSON format compressed with gzip"""
+
+    name = "gzip"
+
+    def join(self, fragments):
+        """returns the file content holding the fragments {key: fragment}"""
+        return gzip.compress(super().join(fragments), compresslevel=6)
+
+    def decode(self, data):
+        """returns the {key: record} dict held by the file content data"""
+        return super().decode(gzip.decompress(data))
+
+    def matches(self, data):
+        """returns True if data was written by this codec"""
+        return data.startswith(b"\x1f\x8b")
+
+
+class LZMACodec(JSONCodec):
+    """the JSON format compressed with xz"""
+
+    name = "lzma"
+
+    def join(self, fragments):
+        """returns the file content holding the fragments {key: fragment}"""
+        return lzma.compress(super().join(fragments))
+
+    def decode(self, data):
+        """returns the {key: record} dict held by the file content data"""
+        return super().decode(lzma.decompress(data))
+
+    def matches(self, data):
+        """returns True if data was written by this codec"""
+        return data.startswith(b"\xfd7zXZ\x00")
+
+
+codecs = {codec.name: codec for codec in
+          (BinaryCodec(), GzipCodec(), LZMACodec(), JSONCodec())}
+
+
+def detect(data):
+    """returns the codec that wrote the file content data
+
+    Defaults to JSON, which also covers files written by hand.
+    """
+    for codec in codecs.values():
+        if codec.matches(data):
+            return codec
+    return codecs["json"]
+
+
+def get(name):
+    """returns the codec called name"""
+    if name not in codecs:
+        raise ValueError("unknown codec: {}".format(name))
+    return codecs[name]
@@ -3,67 +3,625 @@
 Contains the FileStorage class
 """
 
-import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import fcntl
+import os
+from os import getenv
+import threading
 from models.amenity import Amenity
 from models.base_model import BaseModel
+from models.engine import file_codecs
+from models.engine.compact_models import compact
+from models.engine.group_commit import GroupCommit
+from models.engine.object_storage import ObjectStorage
+from models.engine.place_columns import PlaceColumns, fields
+from models.engine.query import Query
 from models.city import City
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from types import MappingProxyType
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# foreign keys indexed from the referenced id back to the objects; a list
+# of ids, like Place.amenity_ids, is indexed under each of them
+references = {"City": ("state_id",),
+              "Place": ("city_id", "user_id", "amenity_ids"),
+              "Review": ("place_id", "user_id")}
 
 
-class FileStorage:
+class FileStorage(ObjectStorage):
     """serializes instances to a JSON file & deserializes back to instances"""
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # boolean - True to keep each class in its own file, e.g. file.City.json
+    __sharded = getenv("HBNB_FILE_LAYOUT") == "sharded"
+    # boolean - True to build the objects read in the compact model layout
+    __compact = getenv("HBNB_MODEL_LAYOUT") == "compact"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects grouped by class name: {name: {key: obj}}
+    __buckets = {}
+    # dictionary - the __objects dict that __buckets was last built from
+    __indexed = None
+    # dictionary - objects by foreign key value:
+    # {(class name, attribute): {id: {key: obj}}}
+    __children = {}
+    # dictionary - the foreign key values each object is indexed under
+    __links = {}
+    # object - the numeric attributes of the places, in columns
+    __columns = PlaceColumns()
+    # dictionary - the encoded form of every object as last read or written,
+    # by file: {path: {key: fragment}}
+    __encoded = {}
+    # object - the codec the file is written with, None until first needed
+    __codec = None
+    # boolean - True once the codec was chosen rather than detected
+    __pinned = False
+    # set - keys of the objects created, changed or deleted since saved
+    __dirty = set()
+    # dictionary - (inode, size, mtime) of every file last read or written
+    __signature = {}
+    # dictionary - records read but not built yet: {name: {key: record}}
+    __raw = {}
+    # dictionary - the __objects dict that the records of __raw belong to
+    __raw_owner = None
+    # object - the GroupCommit writing the file in write-behind mode, False
+    # when saves write it at once, None until HBNB_WRITE_BEHIND is read
+    __committer = None
+    # RLock - guards the objects, records and flags against the writer
+    _lock = threading.RLock()
+    # Lock - lets a single save at a time write the file
+    __write_lock = threading.Lock()
+    # integer - generation of the file last read or written by this process
+    __generation = None
+    # ThreadPoolExecutor - reads the changed shards in parallel, started
+    # the first time more than one changed
+    __reader = None
+    # integer - id of the process __reader was started in; a forked child
+    # inherits the pool but not its threads, so it starts its own
+    __reader_pid = None
+    # integer - bumped whenever an object is added to or removed from
+    # __objects, the version of the whole
+    __version = 0
+    # dictionary - the version the objects of every class were last at
+    __versions = {}
+    # dictionary - the read-only copy all() last returned, for every class
+    # name and None for all of them: {name: (__objects, version, view)}
+    __snapshots = {}
+
+    def __changed(self, name):
+        """starts a new version of the objects of class name"""
+        FileStorage.__version += 1
+        self.__versions[name] = self.__version
+
+    def __snapshot(self, name=None):
+        """returns a read-only copy of the objects of class name, or of
+        all of them
+
+        The copy is made once per version of the objects and shared by
+        every reader until they change again, so readers are not locked
+        out and never see a dictionary change while they iterate it.
+        """
+        snapshot = self.__snapshots.get(name)
+        if snapshot is not None and snapshot[0] is self.__objects and \
+           snapshot[1] == self.__version_of(name):
+            return snapshot[2]
+        with self._lock:
+            objects = self.__objects if name is None else self.__bucket(name)
+            snapshot = (self.__objects, self.__version_of(name),
+                        MappingProxyType(dict(objects)))
+            self.__snapshots[name] = snapshot
+        return snapshot[2]
+
+    def __version_of(self, name):
+        """returns the version of the objects of class name, or of all of
+        them"""
+        if name is None:
+            return self.__version
+        return self.__versions.get(name, 0)
+
+    def __class_name(self, cls):
+        """returns the class name of cls, which is a class or a string"""
+        if isinstance(cls, str):
+            return cls
+        return cls.__name__
+
+    def __bucket(self, name, create=False):
+        """returns the {key: obj} dict holding the objects of class name
+
+        The buckets and the foreign key indexes are rebuilt whenever
+        __objects has been replaced by another dictionary since they were
+        last indexed.
+        """
+        if FileStorage.__indexed is not self.__objects:
+            buckets = {}
+            FileStorage.__children = {}
+            FileStorage.__links = {}
+            FileStorage.__columns = PlaceColumns()
+            for key, obj in self.__objects.items():
+                buckets.setdefault(obj.__class__.__name__, {})[key] = obj
+                self.__link(key, obj)
+            FileStorage.__buckets = buckets
+            FileStorage.__indexed = self.__objects
+        if create:
+            return self.__buckets.setdefault(name, {})
+        return self.__buckets.get(name, {})
+
+    def __link(self, key, obj):
+        """indexes obj under its current foreign key values"""
+        attrs = references.get(obj.__class__.__name__)
+        if attrs is None:
+            return
+        values = tuple(self.__ids(getattr(obj, attr, None))
+                       for attr in attrs)
+        old = self.__links.get(key, (frozenset(),) * len(attrs))
+        for attr, before, after in zip(attrs, old, values):
+            index = self.__children.setdefault(
+                (obj.__class__.__name__, attr), {})
+            for value in before - after:
+                self.__drop(index, value, key)
+            for value in after:
+                index.setdefault(value, {})[key] = obj
+        self.__links[key] = values
+        if isinstance(obj, Place):
+            self.__columns.put(key, obj)
+
+    def __ids(self, value):
+        """returns the set of ids a foreign key attribute holds"""
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return frozenset(value)
+        return frozenset() if value is None else frozenset((value,))
+
+    def __unlink(self, key):
+        """removes key from the foreign key indexes"""
+        values = self.__links.pop(key, None)
+        if values is None:
+            return
+        name = key.split(".", 1)[0]
+        if name == "Place":
+            self.__columns.remove(key)
+        for attr, ids in zip(references[name], values):
+            for value in ids:
+                self.__drop(self.__children.get((name, attr), {}), value, key)
+
+    def __drop(self, index, value, key):
+        """removes key from the objects indexed under value"""
+        keys = index.get(value)
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del index[value]
+
+    def __unbuilt(self):
+        """returns the {name: {key: record}} dict of the records of
+        __objects that were read from the file but not built yet"""
+        if FileStorage.__raw_owner is not self.__objects:
+            FileStorage.__raw = {}
+            FileStorage.__raw_owner = self.__objects
+        return self.__raw
+
+    def __build(self, name, keys=None):
+        """builds the objects of class name read but not built yet, or
+        only those stored under keys"""
+        if name not in classes:
+            return
+        with self._lock:
+            unbuilt = self.__unbuilt()
+            if keys is None:
+                records = unbuilt.pop(name, {})
+            else:
+                pending = unbuilt.get(name, {})
+                records = {key: pending.pop(key) for key in keys
+                           if key in pending}
+            if not records:
+                return
+            bucket = self.__bucket(name, create=True)
+            model = classes[name]
+            if self.__compact:
+                model = compact(model, references.get(name, ()))
+            for key, record in records.items():
+                obj = model.from_storage(record)
+                bucket[key] = obj
+                self.__objects[key] = obj
+                self.__link(key, obj)
+                self.__dirty.discard(key)
+            self.__changed(name)
+
+    def __discard(self, key):
+        """forgets key, built or not, without flagging it as dirty"""
+        name = key.split(".", 1)[0]
+        self.__unbuilt().get(name, {}).pop(key, None)
+        if self.__objects.pop(key, None) is not None:
+            self.__bucket(name).pop(key, None)
+            self.__unlink(key)
+            self.__changed(name)
 
     def all(self, cls=None):
-        """returns the dictionary __objects"""
+        """returns a read-only snapshot of the objects by key
+
+        When cls is given, only the objects of that class are in it. The
+        snapshot does not change when objects are added or deleted
+        later; all() returns a new one then. Objects are built from the
+        records read by reload() when they are first asked for.
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+            name = self.__class_name(cls)
+            self.__build(name)
+            return self.__snapshot(name)
+        for name in list(self.__unbuilt()):
+            self.__build(name)
+        return self.__snapshot()
+
+    def iter(self, cls=None, batch_size=1000):
+        """yields the objects, of class cls if given, without copying
+        them into a snapshot first
+
+        The records read by reload() are built batch_size at a time as
+        the iteration reaches them. Objects deleted meanwhile are skipped.
+        """
+        names = list(classes) if cls is None else [self.__class_name(cls)]
+        for name in names:
+            with self._lock:
+                keys = list(self.__bucket(name))
+                keys.extend(self.__unbuilt().get(name, ()))
+            for start in range(0, len(keys), batch_size):
+                batch = keys[start:start + batch_size]
+                self.__build(name, batch)
+                for key in batch:
+                    obj = self.__objects.get(key)
+                    if obj is not None:
+                        yield obj
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
+            with self._lock:
+                self.__unbuilt().get(name, {}).pop(key, None)
+                self.__bucket(name, create=True)[key] = obj
+                self.__objects[key] = obj
+                self.__unlink(key)
+                self.__link(key, obj)
+                self.__dirty.add(key)
+                self.__changed(name)
+
+    def mark_dirty(self, obj, name=None):
+        """flags obj as changed since the last save if it is stored, and
+        moves it in the foreign key indexes when its attribute name, or
+        any attribute if None, is one they are built from
+
+        Objects not stored and objects already flagged for a change of
+        an attribute that is not indexed are skipped without locking:
+        the attribute is set before this is called, so a save taking the
+        flag away meanwhile still writes the new value.
+        """
+        obj_id = getattr(obj, "id", None)
+        if obj_id is None:
+            return
+        cls_name = obj.__class__.__name__
+        key = cls_name + "." + obj_id
+        if self.__objects.get(key) is not obj:
+            return
+        indexed = name is None or name in references.get(cls_name, ()) or \
+            (cls_name == "Place" and name in fields)
+        if not indexed and key in self.__dirty:
+            return
+        with self._lock:
+            self.__dirty.add(key)
+            if indexed and key in self.__links:
+                self.__link(key, obj)
+
+    def dirty(self):
+        """returns the keys of the objects changed since the last save"""
+        return frozenset(self.__dirty)
+
+    def _clean(self, keys=None):
+        """unflags the given keys, or all of them, and returns those
+        that were flagged"""
+        with self._lock:
+            if keys is None:
+                keys = FileStorage.__dirty
+                FileStorage.__dirty = set()
+            else:
+                keys = self.__dirty.intersection(keys)
+                self.__dirty.difference_update(keys)
+            return keys
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict(fs=True)
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the file (path: __file_path)
+
+        When HBNB_WRITE_BEHIND holds a number of seconds, the file is
+        written by a background thread once for all the saves made within
+        that window, and flush() waits for it.
+        """
+        if self.__committer is None:
+            with self._lock:
+                if FileStorage.__committer is None:
+                    FileStorage.__committer = \
+                        GroupCommit.from_env(self.__persist) or False
+        if self.__committer:
+            self.__committer.request()
+        else:
+            self.__persist()
+
+    def flush(self):
+        """waits until everything saved so far is written to the file"""
+        if self.__committer:
+            self.__committer.flush()
+
+    def __persist(self):
+        """writes the objects to the file
+
+        Only the objects flagged as dirty are encoded again, the encoded
+        form of the others is reused from the last save or reload. With
+        the sharded layout, only the files of the classes with dirty
+        objects are written. Objects can be changed while the files are
+        being written, they are flagged for the next save.
+
+        Other processes are kept out by an exclusive lock on the lock
+        file. If one of them saved since this process last read the file,
+        its changes are merged in first, so only this process's dirty
+        objects overwrite what is on disk.
+        """
+        with self.__write_lock, self.__locked(fcntl.LOCK_EX) as lock:
+            generation = self.__read_generation(lock)
+            with self._lock:
+                if generation != self.__generation:
+                    self.__refresh()
+                codec = self.__writer()
+                dirty = self._clean()
+                try:
+                    writes = self.__encode(codec, dirty)
+                except BaseException:
+                    self.__dirty.update(dirty)
+                    raise
+            try:
+                for path, fragments in writes:
+                    tmp_path = path + ".tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(codec.join(fragments))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, path)
+                    with self._lock:
+                        self.__encoded[path] = fragments
+                        self.__signature[path] = \
+                            self.__identity(os.stat(path))
+            except BaseException:
+                with self._lock:
+                    self.__dirty.update(dirty)
+                raise
+            FileStorage.__generation = self.__write_generation(
+                lock, (generation or 0) + 1)
+
+    def __encode(self, codec, dirty):
+        """returns the [(path, {key: fragment})] of the files to write"""
+        touched = {self.__path(key.split(".", 1)[0]) for key in dirty}
+        writes = []
+        for path, names in self.__shards().items():
+            cached = self.__encoded.get(path)
+            if self.__sharded and cached is not None and \
+               path not in touched:
+                continue
+            fragments = self.__fragments(names, codec, dirty, cached)
+            if self.__sharded and cached is None and not fragments:
+                continue
+            writes.append((path, fragments))
+        return writes
+
+    def __fragments(self, names, codec, dirty, cached):
+        """returns the {key: fragment} of the objects of the classes names,
+        encoding only those that are dirty or not in cached"""
+        cached = cached or {}
+        unbuilt = self.__unbuilt()
+        fragments = {}
+        for name in names:
+            for key, obj in self.__bucket(name).items():
+                fragment = cached.get(key)
+                if fragment is None or key in dirty:
+                    fragment = codec.encode(obj.to_dict(fs=True))
+                fragments[key] = fragment
+            for key, record in unbuilt.get(name, {}).items():
+                fragment = cached.get(key)
+                if fragment is None:
+                    fragment = codec.encode(record)
+                fragments[key] = fragment
+        return fragments
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the file to __objects, whatever codec wrote it
+
+        Nothing is parsed for a file that is still the one last read or
+        written. Otherwise the objects whose record changed or went away
+        are dropped, and the changed records are kept to be built into
+        objects the first time they are asked for. With the sharded
+        layout, the files of the classes are read in parallel.
+        """
+        with self.__locked(fcntl.LOCK_SH) as lock:
+            generation = self.__read_generation(lock)
+            with self._lock:
+                self.__refresh()
+                FileStorage.__generation = generation
+
+    def __refresh(self):
+        """applies the changes made to the file(s) since last read
+
+        Every file is stat-ed first and only those whose signature
+        changed are read, in parallel when there are several.
+        """
+        stats = self.__stats(self.__shards())
+        if self.__sharded and not stats:
+            stats = self.__stats([self.__file_path])
+        paths = [path for path, st in stats.items()
+                 if self.__signature.get(path) != self.__identity(st)]
+        if len(paths) > 1:
+            if FileStorage.__reader_pid != os.getpid():
+                FileStorage.__reader = ThreadPoolExecutor(len(classes))
+                FileStorage.__reader_pid = os.getpid()
+            results = list(self.__reader.map(self.__read, paths))
+        else:
+            results = [self.__read(path) for path in paths]
+        for path, result in zip(paths, results):
+            if result is not None:
+                self.__load(path, *result)
+
+    def __stats(self, paths):
+        """returns the {path: stat} of the files of paths that exist"""
+        stats = {}
+        for path in paths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                pass
+        return stats
+
+    @contextmanager
+    def __locked(self, operation):
+        """holds the lock file next to __file_path locked with operation
+
+        Yields the descriptor of the lock file, or None when it cannot be
+        opened, e.g. in a read-only directory.
+        """
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            fd = os.open(self.__file_path + ".lock",
+                         os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            yield None
+            return
+        try:
+            fcntl.flock(fd, operation)
+            yield fd
+        finally:
+            os.close(fd)
+
+    def __read_generation(self, fd):
+        """returns the number of saves recorded in the lock file fd"""
+        if fd is None:
+            return None
+        try:
+            return int(os.pread(fd, 32, 0) or 0)
+        except ValueError:
+            return None
+
+    def __write_generation(self, fd, generation):
+        """records generation in the lock file fd and returns it"""
+        if fd is not None:
+            os.pwrite(fd, b"%020d\n" % generation, 0)
+        return generation
+
+    def __read(self, path):
+        """returns the (stat, codec, records) of the file at path, or None
+        if it is missing, unreadable or the one last read or written"""
+        try:
+            with open(path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                if self.__signature.get(path) == self.__identity(st):
+                    return None
+                data = f.read()
+            detected = file_codecs.detect(data)
+            return st, detected, detected.decode(data)
         except Exception:
-            pass
+            return None
+
+    def __load(self, path, st, detected, records):
+        """applies the records read from the file at path to __objects
+
+        The objects changed by this process and not saved yet are kept.
+        """
+        codec = self.__writer(detected)
+        cached = self.__encoded.get(path, {})
+        encoded = {}
+        unbuilt = self.__unbuilt()
+        dirty = self.__dirty
+        for key in cached.keys() - records.keys() - dirty:
+            self.__discard(key)
+        for key, record in records.items():
+            name = record.get("__class__")
+            if name not in classes:
+                continue
+            fragment = codec.encode(record)
+            if key not in dirty and (fragment != cached.get(key) or (
+                    key not in self.__objects and
+                    key not in unbuilt.get(name, {}))):
+                self.__discard(key)
+                unbuilt.setdefault(name, {})[key] = record
+            encoded[key] = fragment
+        self.__encoded[path] = encoded
+        self.__signature[path] = self.__identity(st)
+
+    def __path(self, name):
+        """returns the path of the file holding the objects of class name"""
+        if not self.__sharded:
+            return self.__file_path
+        root, ext = os.path.splitext(self.__file_path)
+        return "{}.{}{}".format(root, name, ext)
+
+    def __shards(self):
+        """returns the {path: [class names]} of the files objects live in"""
+        self.__bucket(None)
+        names = set(classes).union(self.__buckets, self.__unbuilt())
+        shards = {}
+        for name in sorted(names):
+            shards.setdefault(self.__path(name), []).append(name)
+        return shards
+
+    def convert(self, name):
+        """rewrites the file with the codec called name and keeps it"""
+        codec = file_codecs.get(name)
+        with self.__write_lock, self._lock:
+            FileStorage.__pinned = True
+            if codec is not self.__codec:
+                FileStorage.__codec = codec
+                FileStorage.__encoded = {}
+        self.save()
+        self.flush()
+
+    def __writer(self, detected=None):
+        """returns the codec to write the file with
+
+        HBNB_FILE_CODEC or convert() choose it. Otherwise the file keeps
+        the format it was last read in, JSON for a new file.
+        """
+        codec = self.__codec
+        if codec is None and getenv("HBNB_FILE_CODEC"):
+            codec = file_codecs.get(getenv("HBNB_FILE_CODEC"))
+            FileStorage.__pinned = True
+        elif not self.__pinned:
+            codec = detected or codec or file_codecs.get("json")
+        if codec is not self.__codec:
+            FileStorage.__codec = codec
+            FileStorage.__encoded = {}
+        return codec
+
+    def __identity(self, st):
+        """returns the signature of the file described by the stat st"""
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
 
     def delete(self, obj=None):
-        """delete obj from __objects if it’s inside"""
+        """delete obj from __objects if it’s inside
+
+        A deleted amenity is also removed from the places linked to it.
+        """
         if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            name = obj.__class__.__name__
+            key = name + '.' + obj.id
+            with self._lock:
+                self.__unbuilt().get(name, {}).pop(key, None)
+                if key in self.__objects:
+                    del self.__objects[key]
+                    self.__bucket(name).pop(key, None)
+                    self.__unlink(key)
+                    self.__dirty.add(key)
+                    self.__changed(name)
+                if name == "Amenity":
+                    for place in self.children(Place, "amenity_ids", obj.id):
+                        self.unlink(place, obj)
 
     def close(self):
         """call reload() method for deserializing the JSON file to objects"""
@@ -73,20 +631,95 @@ class FileStorage:
         """ Returns the object based on the class and its ID
         or None if not found """
         if cls is not None and id is not None:
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    if value.id == id:
-                        return value
+            name = self.__class_name(cls)
+            key = "{}.{}".format(name, id)
+            if key not in self.__objects:
+                self.__build(name, (key,))
+            return self.__objects.get(key)
         return None
 
+    def children(self, cls, attr, id):
+        """returns the objects of class cls whose attribute attr is id,
+        e.g. the cities of a state with children(City, "state_id", id)"""
+        name = self.__class_name(cls)
+        if attr not in references.get(name, ()):
+            return [obj for obj in self.all(name).values()
+                    if getattr(obj, attr, None) == id]
+        with self._lock:
+            self.__build(name)
+            self.__bucket(name)
+            return list(self.__children.get((name, attr), {})
+                        .get(id, {}).values())
+
+    def find_places(self, city_ids=None, ranges=None):
+        """returns the places in one of city_ids, when given, whose numeric
+        attributes are within ranges: {attribute: (low, high)}, None
+        being unbounded"""
+        with self._lock:
+            self.__build("Place")
+            self.__bucket("Place")
+            return self.__columns.match(city_ids, ranges)
+
+    def query(self, cls):
+        """returns a Query on the objects of class cls"""
+        return Query(self, cls)
+
+    def select(self, query):
+        """returns an iterator over the objects query asks for"""
+        return query.arrange(self.__candidates(query))
+
+    def __candidates(self, query):
+        """returns objects including all those meeting the conditions of
+        query, as few as the indexes allow
+
+        Conditions on the id are answered with get(), those on a foreign
+        key with the foreign key indexes and those on the numbers of a
+        place with its columns; the smallest set found is kept. Without
+        such conditions, every object of the class is a candidate.
+        """
+        name = query.name
+        found = []
+        city_ids = None
+        ranges = {}
+        for attr, op, value in query.conditions:
+            values = value if op == "in" else (value,)
+            if op not in ("eq", "in", "contains") or \
+               not all(isinstance(item, str) for item in values):
+                values = None
+            if attr == "id" and op != "contains" and values is not None:
+                objs = (self.get(name, item) for item in values)
+                found.append([obj for obj in objs if obj is not None])
+            elif attr in references.get(name, ()) and values is not None:
+                objs = {}
+                for item in values:
+                    objs.update((obj.id, obj) for obj in
+                                self.children(name, attr, item))
+                found.append(list(objs.values()))
+                if attr == "city_id":
+                    city_ids = set(values) if city_ids is None else \
+                        city_ids.intersection(values)
+            elif name == "Place" and attr in fields and \
+                    op in ("lt", "lte", "gt", "gte") and \
+                    type(value) in (int, float):
+                low, high = ranges.get(attr, (None, None))
+                if op in ("gt", "gte"):
+                    low = value if low is None else max(low, value)
+                else:
+                    high = value if high is None else min(high, value)
+                ranges[attr] = (low, high)
+        if ranges:
+            found.append(self.find_places(city_ids, ranges))
+        if found:
+            return min(found, key=len)
+        return self.all(name).values()
+
     def count(self, cls=None):
         """ Returns the number of objects of the given class,
         or returns the count of all objects in storage """
+        unbuilt = self.__unbuilt()
         if cls is not None:
-            count = 0
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    count += 1
-            return count
+            name = self.__class_name(cls)
+            return len(self.__bucket(name)) + len(unbuilt.get(name, {}))
         else:
-            return len(self.__objects)
+            return len(self.__objects) + sum(len(records)
+                                             for records in unbuilt.values())
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the GroupCommit class
+"""
+
+import atexit
+import os
+from os import getenv
+import threading
+import time
+
+
+class GroupCommit:
+    """calls a flush function from a background thread, once for all the
+    saves requested within a window of time
+
+    request() returns at once. flush() is the durability barrier: it
+    returns when every save requested before it has been written, or
+    raises the error the write failed with.
+    """
+
+    def __init__(self, flush, window):
+        """Instantiate a GroupCommit calling flush window seconds after
+        the first of a group of requests"""
+        self.__flush = flush
+        self.__window = window
+        self.__start()
+
+    def __start(self):
+        """resets the counters and the thread, in the calling process"""
+        # integer - id of the process the counters and the thread belong to
+        self.__pid = os.getpid()
+        self.__cond = threading.Condition()
+        # integer - number of saves requested so far
+        self.__requested = 0
+        # integer - number of requested saves written, or failed, so far
+        self.__done = 0
+        # exception - what the last write failed with, None if it worked
+        self.__error = None
+        # boolean - True when a caller is waiting in flush()
+        self.__urgent = False
+        self.__thread = None
+
+    @classmethod
+    def from_env(cls, flush):
+        """returns a GroupCommit for flush when HBNB_WRITE_BEHIND holds a
+        window in seconds, None when saves are to be written at once"""
+        window = float(getenv("HBNB_WRITE_BEHIND") or 0)
+        if window <= 0:
+            return None
+        return cls(flush, window)
+
+    def __owned(self):
+        """starts over in a process forked from the one that used self,
+        which inherited the counters and the thread object but not the
+        thread; the parent writes the saves requested before the fork"""
+        if self.__pid != os.getpid():
+            self.__start()
+
+    def request(self):
+        """schedules a write of everything saved so far"""
+        self.__owned()
+        with self.__cond:
+            self.__requested += 1
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run,
+                                                 daemon=True)
+                self.__thread.start()
+                atexit.register(self.__drain)
+            self.__cond.notify_all()
+
+    def flush(self):
+        """waits until every save requested so far is written"""
+        self.__owned()
+        with self.__cond:
+            target = self.__requested
+            while self.__done < target:
+                self.__urgent = True
+                self.__cond.notify_all()
+                self.__cond.wait()
+            if target and self.__error is not None:
+                raise self.__error
+
+    def __drain(self):
+        """writes the saves still pending when the interpreter exits"""
+        with self.__cond:
+            pending = self.__done < self.__requested
+        if pending:
+            self.flush()
+
+    def __run(self):
+        """writes the requested saves, one group at a time"""
+        while True:
+            with self.__cond:
+                while self.__done == self.__requested:
+                    self.__cond.wait()
+                deadline = time.monotonic() + self.__window
+                while not self.__urgent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__cond.wait(remaining)
+                self.__urgent = False
+                target = self.__requested
+            try:
+                self.__flush()
+                error = None
+            except Exception as e:
+                error = e
+            with self.__cond:
+                self.__done = target
+                self.__error = error
+                self.__cond.notify_all()
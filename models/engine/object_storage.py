@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the ObjectStorage class
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import os
+
+# objects deleted along with an object of a class by cascade_delete(): the
+# (class name, foreign key) of its children
+cascades = {"State": (("City", "state_id"),),
+            "City": (("Place", "city_id"),),
+            "Place": (("Review", "place_id"),),
+            "User": (("Place", "user_id"), ("Review", "user_id"))}
+
+
+def dependents(storage, obj):
+    """returns obj followed by every object of storage that depends on
+    it through the foreign keys of cascades, directly or not"""
+    found = [obj]
+    seen = {obj.__class__.__name__ + "." + obj.id}
+    for parent in found:
+        for name, attr in cascades.get(parent.__class__.__name__, ()):
+            for child in storage.children(name, attr, parent.id):
+                key = name + "." + child.id
+                if key not in seen:
+                    seen.add(key)
+                    found.append(child)
+    return found
+
+
+class ObjectStorage:
+    """operations shared by the engines storing the instances themselves
+
+    They are written in terms of get(), new(), delete(), children(),
+    count() and save(), holding _lock, the RLock of the engine guarding
+    its objects, so that a batch is saved in a single write.
+    """
+
+    # object - the executor running the cascading deletes asked for in the
+    # background, None until first needed
+    __deleter = None
+    # integer - id of the process __deleter was started in; a forked child
+    # inherits the executor but not its thread, so it starts its own
+    __deleter_pid = None
+
+    def bulk_new(self, objs):
+        """adds every object of objs and saves them in a single write"""
+        with self._lock:
+            for obj in objs:
+                self.new(obj)
+        self.save()
+
+    def bulk_delete(self, objs):
+        """deletes every object of objs and saves in a single write"""
+        with self._lock:
+            for obj in objs:
+                self.delete(obj)
+        self.save()
+
+    def bulk_update(self, cls, ids, changes):
+        """sets the attributes changes: {name: value} of the objects of
+        class cls whose id is in ids, saves them in a single write and
+        returns how many were found
+
+        The id and timestamps are left out of changes; updated_at is set
+        to the same time on every object.
+        """
+        changes = {name: value for name, value in changes.items()
+                   if name not in ("id", "created_at", "updated_at",
+                                   "__class__")}
+        now = datetime.utcnow()
+        found = 0
+        with self._lock:
+            for id in ids:
+                obj = self.get(cls, id)
+                if obj is None:
+                    continue
+                for name, value in changes.items():
+                    setattr(obj, name, value)
+                obj.updated_at = now
+                found += 1
+        self.save()
+        return found
+
+    def cascade_delete(self, obj, background=False):
+        """deletes obj and every object depending on it, e.g. the cities
+        of a state with their places and reviews, in a single write
+
+        With background, the deletion runs in a worker thread and a
+        Future is returned.
+        """
+        if background:
+            with self._lock:
+                if ObjectStorage.__deleter_pid != os.getpid():
+                    ObjectStorage.__deleter = ThreadPoolExecutor(1)
+                    ObjectStorage.__deleter_pid = os.getpid()
+            return self.__deleter.submit(self.cascade_delete, obj)
+        with self._lock:
+            for dependent in dependents(self, obj):
+                self.delete(dependent)
+        self.save()
+
+    def link(self, place, amenity):
+        """associates amenity with place, stored on the next save"""
+        if amenity.id not in place.amenity_ids:
+            place.amenity_ids = place.amenity_ids + [amenity.id]
+
+    def unlink(self, place, amenity):
+        """dissociates amenity from place, stored on the next save"""
+        if amenity.id in place.amenity_ids:
+            place.amenity_ids = [amenity_id for amenity_id in place.amenity_ids
+                                 if amenity_id != amenity.id]
+
+    def get_many(self, cls, ids):
+        """returns the {id: object} dict of the objects of class cls whose
+        id is in ids"""
+        found = {}
+        for id in ids:
+            obj = self.get(cls, id)
+            if obj is not None:
+                found[id] = obj
+        return found
+
+    def counts(self, max_age=0):
+        """returns the {class name: count} dict of every class; the counts
+        are kept up to date, so max_age makes no difference"""
+        from models.engine.file_storage import classes
+        return {name: self.count(name) for name in classes}
+
+    def read_from_replicas(self, enabled=True):
+        """does nothing, the objects have no replicas to be read from"""
+        pass
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceColumns class
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# numeric attributes of Place kept in columns
+fields = ("price_by_night", "number_rooms", "number_bathrooms",
+          "max_guest", "latitude", "longitude")
+
+
+def value_of(obj, field):
+    """returns the attribute field of obj as a float, NaN if it is not a
+    number"""
+    try:
+        return float(getattr(obj, field, None))
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def matches(obj, city_ids=None, ranges=None):
+    """returns True if obj is in one of city_ids, when given, and its
+    fields are within ranges: {field: (low, high)}, None being unbounded"""
+    if city_ids is not None and obj.city_id not in city_ids:
+        return False
+    for field, (low, high) in (ranges or {}).items():
+        value = value_of(obj, field)
+        if low is not None and not value >= low:
+            return False
+        if high is not None and not value <= high:
+            return False
+    return True
+
+
+class PlaceColumns:
+    """keeps the numeric attributes and the city of places in columns
+
+    Each place is a row of one array per field, so a search compares
+    whole columns at once and only builds the list of the places that
+    match. Deleting a row moves the last row into its slot to keep the
+    columns dense. Without NumPy, the rows are matched one by one.
+    """
+
+    def __init__(self):
+        """Instantiate an empty PlaceColumns"""
+        # dictionary - row of every place by key
+        self.__rows = {}
+        # list - key of the place in every row
+        self.__keys = []
+        # list - the place in every row
+        self.__objs = []
+        # dictionary - small integer standing for every city id seen
+        self.__codes = {}
+        self.__columns = {}
+        self.__city = None
+        if numpy is not None:
+            self.__columns = {field: numpy.empty(0) for field in fields}
+            self.__city = numpy.empty(0, dtype=numpy.int64)
+
+    def __len__(self):
+        """returns the number of places"""
+        return len(self.__keys)
+
+    def put(self, key, obj):
+        """adds the place obj stored under key, or updates its row"""
+        row = self.__rows.get(key)
+        if row is None:
+            row = len(self.__keys)
+            self.__rows[key] = row
+            self.__keys.append(key)
+            self.__objs.append(obj)
+            self.__grow(row + 1)
+        else:
+            self.__objs[row] = obj
+        if numpy is not None:
+            for field in fields:
+                self.__columns[field][row] = value_of(obj, field)
+            self.__city[row] = self.__codes.setdefault(
+                obj.city_id, len(self.__codes))
+
+    def remove(self, key):
+        """removes the place stored under key"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self.__keys) - 1
+        if row != last:
+            moved = self.__keys[last]
+            self.__rows[moved] = row
+            self.__keys[row] = moved
+            self.__objs[row] = self.__objs[last]
+            if numpy is not None:
+                for column in self.__columns.values():
+                    column[row] = column[last]
+                self.__city[row] = self.__city[last]
+        self.__keys.pop()
+        self.__objs.pop()
+
+    def match(self, city_ids=None, ranges=None):
+        """returns the places in one of city_ids, when given, whose fields
+        are within ranges: {field: (low, high)}, None being unbounded"""
+        size = len(self.__keys)
+        if numpy is None:
+            return [obj for obj in self.__objs
+                    if matches(obj, city_ids, ranges)]
+        mask = numpy.ones(size, dtype=bool)
+        if city_ids is not None:
+            codes = [self.__codes[city_id] for city_id in city_ids
+                     if city_id in self.__codes]
+            mask &= numpy.isin(self.__city[:size], codes)
+        for field, (low, high) in (ranges or {}).items():
+            column = self.__columns[field][:size]
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        objs = self.__objs
+        return [objs[row] for row in numpy.flatnonzero(mask)]
+
+    def __grow(self, size):
+        """makes room in the columns for size rows, doubling them"""
+        if numpy is None or len(self.__city) >= size:
+            return
+        capacity = max(16, 2 * len(self.__city))
+        for field, column in self.__columns.items():
+            self.__columns[field] = self.__copy(column, capacity)
+        self.__city = self.__copy(self.__city, capacity)
+
+    def __copy(self, column, capacity):
+        """returns column copied into a larger array of capacity rows"""
+        larger = numpy.empty(capacity, dtype=column.dtype)
+        larger[:len(column)] = column
+        return larger
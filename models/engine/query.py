@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Contains the Query class
+"""
+
+import copy
+from itertools import islice
+import operator
+
+# the comparisons filter() accepts after the name of an attribute, as in
+# price_by_night__lte=100; a bare attribute name compares with eq
+operators = {"eq": operator.eq, "ne": operator.ne,
+             "lt": operator.lt, "lte": operator.le,
+             "gt": operator.gt, "gte": operator.ge,
+             "in": lambda value, values: value in values,
+             "contains": lambda value, item: item in value}
+
+
+class Query:
+    """a query on the objects of one class, run by the storage engine
+    that made it when it is iterated
+
+    filter(), order_by() and limit() return a new query, so a query can
+    be refined without changing the one it was made from. Engines read
+    the query from its attributes and may hand the rest of the work to
+    arrange(), which checks, orders and limits any candidate objects.
+    """
+
+    def __init__(self, storage, cls):
+        """Instantiate a Query on the objects of class cls of storage"""
+        self.storage = storage
+        self.name = cls if isinstance(cls, str) else cls.__name__
+        # tuple - (attribute, operator name, value) of every condition
+        self.conditions = ()
+        # tuple - (attribute, True if descending) to order the objects by
+        self.ordering = ()
+        # integer - maximum number of objects, None for all of them
+        self.size = None
+
+    def __iter__(self):
+        """runs the query and returns an iterator over its objects"""
+        return iter(self.storage.select(self))
+
+    def filter(self, **conditions):
+        """returns the query keeping only the objects meeting conditions,
+        e.g. city_id=id, price_by_night__lte=100 or id__in=ids"""
+        added = []
+        for key, value in conditions.items():
+            attr, separator, name = key.partition("__")
+            name = name or "eq"
+            if name not in operators:
+                raise ValueError("unknown operator: {}".format(key))
+            if name == "in":
+                value = frozenset(value)
+            added.append((attr, name, value))
+        return self.__refine(conditions=self.conditions + tuple(added))
+
+    def order_by(self, *attrs):
+        """returns the query ordering the objects by attrs, an attribute
+        name starting with - being in descending order"""
+        ordering = tuple((attr.lstrip("-"), attr.startswith("-"))
+                         for attr in attrs)
+        return self.__refine(ordering=self.ordering + ordering)
+
+    def limit(self, size):
+        """returns the query stopping after size objects"""
+        return self.__refine(size=size)
+
+    def first(self):
+        """returns the first object of the query, None if there is none"""
+        return next(iter(self.limit(1)), None)
+
+    def matches(self, obj):
+        """returns True if obj meets every condition of the query"""
+        for attr, name, value in self.conditions:
+            try:
+                if not operators[name](getattr(obj, attr, None), value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    def arrange(self, objs):
+        """returns an iterator over the objects of objs meeting the
+        conditions, in order and up to the limit of the query"""
+        objs = (obj for obj in objs if self.matches(obj))
+        if self.ordering:
+            objs = list(objs)
+            for attr, descending in reversed(self.ordering):
+                objs.sort(key=lambda obj: self.__sort_key(obj, attr),
+                          reverse=descending)
+        if self.size is not None:
+            objs = islice(objs, self.size)
+        return iter(objs)
+
+    def __sort_key(self, obj, attr):
+        """returns the key ordering obj by attr, missing values last"""
+        value = getattr(obj, attr, None)
+        return (value is None, value)
+
+    def __refine(self, **changes):
+        """returns a copy of the query with the attributes changes"""
+        query = copy.copy(self)
+        for attr, value in changes.items():
+            setattr(query, attr, value)
+        return query
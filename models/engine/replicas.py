@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Contains the Replicas and RoutingSession classes
+"""
+
+from itertools import count
+import threading
+import time
+from sqlalchemy import event, exc, text
+from sqlalchemy.orm import Session
+
+
+class Replicas:
+    """pool of the engines of the read replicas of a database
+
+    pick() takes the replicas in turn, skipping those found down. A
+    replica is checked with SELECT 1 when it has not been for interval
+    seconds, and is left out for interval seconds once a check or a
+    statement fails on it because the database cannot be reached.
+    """
+
+    def __init__(self, engines, interval=5.0):
+        """Instantiate the pool of the replicas engines, checked every
+        interval seconds"""
+        # list - engines of the replicas
+        self.engines = list(engines)
+        # float - seconds a check of a replica is trusted for
+        self.interval = interval
+        # dictionary - monotonic time each engine was last found up
+        self.__checked = {}
+        # dictionary - monotonic time until which each engine is down
+        self.__down = {}
+        self.__turn = count()
+        self.__lock = threading.Lock()
+        for engine in self.engines:
+            event.listen(engine, "handle_error", self.__failed)
+
+    def pick(self):
+        """returns the engine of the next replica up, None if all of them
+        are down"""
+        for i in range(len(self.engines)):
+            engine = self.engines[next(self.__turn) % len(self.engines)]
+            if self.healthy(engine):
+                return engine
+        return None
+
+    def healthy(self, engine):
+        """returns True if engine is not known to be down, checking it
+        when its last check is too old"""
+        now = time.monotonic()
+        with self.__lock:
+            if self.__down.get(engine, 0) > now:
+                return False
+            if now - self.__checked.get(engine, float("-inf")) < \
+               self.interval:
+                return True
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except exc.DBAPIError:
+            self.mark_down(engine)
+            return False
+        with self.__lock:
+            self.__checked[engine] = time.monotonic()
+        return True
+
+    def mark_down(self, engine):
+        """leaves engine out for interval seconds"""
+        with self.__lock:
+            self.__down[engine] = time.monotonic() + self.interval
+            self.__checked.pop(engine, None)
+
+    def __failed(self, context):
+        """marks the engine of a statement down if it lost its database
+        or could not connect to it"""
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+
+class RoutingSession(Session):
+    """session sending its reads to the engine route(session) returns,
+    when it returns one, and everything else to its own bind
+
+    Flushes and INSERT, UPDATE or DELETE statements always go to the
+    bind, the primary database.
+    """
+
+    def __init__(self, route=None, **kwargs):
+        """Instantiate a RoutingSession reading through route"""
+        super().__init__(**kwargs)
+        self.route = route
+
+    def get_bind(self, mapper=None, **kwargs):
+        """returns the engine a statement of the session runs on"""
+        clause = kwargs.get("clause")
+        if self.route is not None and not self._flushing and \
+           not getattr(clause, "is_dml", False):
+            engine = self.route(self)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, **kwargs)
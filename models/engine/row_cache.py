@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Contains the RowCache class
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class RowCache:
+    """bounded cache of detached rows shared by the threads of a process
+
+    Rows are kept by identity key, the least recently used going first
+    once the cache is full, and for at most max_age seconds, so that the
+    writes of other processes are seen after that long. Every eviction
+    moves the generation forward: a row read from the database before a
+    commit changed it is only put in the cache if the generation it was
+    read at is still current.
+    """
+
+    def __init__(self, size, max_age=float("inf")):
+        """Instantiate a RowCache of at most size rows, 0 for none, each
+        kept at most max_age seconds"""
+        # integer - maximum number of rows kept
+        self.size = size
+        # float - seconds a row is kept for
+        self.max_age = max_age
+        # integer - number of evictions so far
+        self.generation = 0
+        # OrderedDict - (detached row, monotonic time it expires at) by
+        # key, least recently used first
+        self.__rows = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        """returns the number of rows kept"""
+        return len(self.__rows)
+
+    def get(self, key):
+        """returns the row kept under key, None if there is none"""
+        with self.__lock:
+            entry = self.__rows.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self.__rows[key]
+                return None
+            self.__rows.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, row, generation):
+        """keeps row under key unless the cache changed since generation"""
+        with self.__lock:
+            if generation != self.generation or self.size <= 0:
+                return
+            self.__rows[key] = (row, time.monotonic() + self.max_age)
+            self.__rows.move_to_end(key)
+            while len(self.__rows) > self.size:
+                self.__rows.popitem(last=False)
+
+    def evict(self, keys):
+        """forgets the rows kept under keys"""
+        with self.__lock:
+            self.generation += 1
+            for key in keys:
+                self.__rows.pop(key, None)
+
+    def clear(self):
+        """forgets every row"""
+        with self.__lock:
+            self.generation += 1
+            self.__rows.clear()
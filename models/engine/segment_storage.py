@@ -0,0 +1,590 @@
+#!/usr/bin/python3
+"""
+Contains the SegmentStorage class
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+import fcntl
+import json
+import mmap
+import os
+from os import getenv
+import struct
+import threading
+from models.engine.file_storage import classes
+from models.engine.group_commit import GroupCommit
+from models.engine.object_storage import ObjectStorage
+from models.engine.place_columns import matches
+from models.engine.query import Query
+
+# index file layout: a header followed by entries sorted by key
+header = struct.Struct("<8sQQQ")
+entry = struct.Struct("<96sQI")
+magic = b"HBNBIDX1"
+
+
+class Index:
+    """read-only view of a sorted key -> (offset, length) index file"""
+
+    def __init__(self, path=None):
+        """maps the index file at path, or is empty if there is none"""
+        self.generation = 0
+        self.covered = 0
+        self.size = 0
+        self.__map = None
+        if path is None or not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mark, self.generation, self.covered, self.size = \
+            header.unpack_from(self.__map, 0)
+        if mark != magic:
+            raise ValueError("{} is not an index file".format(path))
+
+    def __len__(self):
+        """returns the number of entries"""
+        return self.size
+
+    def key(self, i):
+        """returns the key of the entry at position i"""
+        start = header.size + i * entry.size
+        return self.__map[start:start + 96].rstrip(b"\0").decode()
+
+    def location(self, i):
+        """returns the (offset, length) of the entry at position i"""
+        return entry.unpack_from(self.__map,
+                                 header.size + i * entry.size)[1:]
+
+    def bisect(self, key):
+        """returns the position of the first entry not below key"""
+        lo, hi = 0, self.size
+        key = key.encode()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = header.size + mid * entry.size
+            if self.__map[start:start + 96].rstrip(b"\0") < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key):
+        """returns the (offset, length) of key or None if missing"""
+        i = self.bisect(key)
+        if i < self.size and self.key(i) == key:
+            return self.location(i)
+        return None
+
+    def span(self, prefix):
+        """returns the positions (start, stop) of the keys with prefix"""
+        if not prefix:
+            return 0, self.size
+        return self.bisect(prefix), self.bisect(prefix[:-1] +
+                                                chr(ord(prefix[-1]) + 1))
+
+    def close(self):
+        """unmaps the index file"""
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+
+class SegmentView(Mapping):
+    """read-only mapping of the stored objects of one class, or all
+
+    Objects are read from the segment file when they are looked up, so
+    going through the view only keeps the storage cache in memory.
+    """
+
+    def __init__(self, storage, name=None):
+        """creates the view of the objects of class name in storage"""
+        self.__storage = storage
+        self.__name = name
+        self.__prefix = "" if name is None else name + "."
+
+    def __getitem__(self, key):
+        """returns the object stored under key"""
+        if key.startswith(self.__prefix):
+            obj = self.__storage.load(key)
+            if obj is not None:
+                return obj
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        """returns True if an object is stored under key"""
+        return key.startswith(self.__prefix) and self.__storage.exists(key)
+
+    def __iter__(self):
+        """iterates over the keys of the stored objects"""
+        return self.__storage.keys(self.__prefix)
+
+    def __len__(self):
+        """returns the number of stored objects"""
+        return self.__storage.count(self.__name)
+
+
+class SegmentStorage(ObjectStorage):
+    """stores objects in an append-only segment file with an on-disk index
+
+    Every save appends the changed objects to the segment file. A sorted
+    index file maps each key to the offset and length of its last record;
+    changes not merged into it yet are kept in a bounded delta. Only the
+    HBNB_SEGMENT_CACHE most recently used objects stay materialized, all
+    others are read back from the segment when they are looked up.
+
+    Processes sharing the files take turns through a lock file next to
+    them: appends, index merges and compactions hold it exclusive after
+    picking up what the others wrote, reloads hold it shared.
+    """
+
+    # string - base path of the segment and index files
+    __file_path = "file.seg"
+    # integer - number of delta entries that triggers an index merge
+    __merge_after = 10000
+
+    def __init__(self):
+        """Instantiate a SegmentStorage object"""
+        self.__cache_size = int(getenv("HBNB_SEGMENT_CACHE", "10000"))
+        # OrderedDict - materialized objects, least recently used first
+        self.__cache = OrderedDict()
+        # dictionary - objects changed since saved, None when deleted
+        self.__pending = {}
+        # dictionary - locations not merged into the index, None if deleted
+        self.__delta = {}
+        # dictionary - number of live objects by class name
+        self.__counts = {}
+        self.__index = Index()
+        self.__identity = ()
+        self.__segment = None
+        # integer - offset in the segment up to which records are indexed
+        self.__seen = 0
+        # integer - bytes of the segment taken by superseded records
+        self.__garbage = 0
+        self.__quiet = False
+        self._lock = threading.RLock()
+        self.__committer = GroupCommit.from_env(self.__append)
+
+    def all(self, cls=None):
+        """returns a read-only mapping of the objects, by class if given"""
+        if cls is None:
+            return SegmentView(self)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return SegmentView(self, cls)
+
+    def iter(self, cls=None, batch_size=1000):
+        """yields the objects, of class cls if given, read from the
+        segment one at a time; keys() already reads the index in batches
+        and only the storage cache stays in memory, whatever batch_size
+        is"""
+        prefix = ""
+        if cls is not None:
+            prefix = (cls if isinstance(cls, str) else cls.__name__) + "."
+        for key in self.keys(prefix):
+            obj = self.load(key)
+            if obj is not None:
+                yield obj
+
+    def new(self, obj):
+        """adds obj to the objects to write on the next save"""
+        if obj is not None:
+            key = obj.__class__.__name__ + "." + obj.id
+            if len(key.encode()) > 96:
+                raise ValueError("key too long: {}".format(key))
+            with self._lock:
+                if not self.exists(key):
+                    self.__count(key, 1)
+                self.__cache.pop(key, None)
+                self.__pending[key] = obj
+
+    def delete(self, obj=None):
+        """removes obj from storage on the next save
+
+        A deleted amenity is also removed from the places linked to it.
+        """
+        if obj is not None:
+            key = obj.__class__.__name__ + "." + obj.id
+            with self._lock:
+                if self.exists(key):
+                    self.__count(key, -1)
+                    self.__cache.pop(key, None)
+                    self.__pending[key] = None
+                if key.startswith("Amenity."):
+                    for place in self.children("Place", "amenity_ids",
+                                               obj.id):
+                        self.unlink(place, obj)
+
+    def mark_dirty(self, obj, name=None):
+        """flags obj to be written on the next save if it is stored,
+        whatever attribute name changed"""
+        obj_id = getattr(obj, "id", None)
+        if obj_id is None:
+            return
+        key = obj.__class__.__name__ + "." + obj_id
+        with self._lock:
+            if self.__quiet or key in self.__pending:
+                return
+            if self.exists(key):
+                self.__cache.pop(key, None)
+                self.__pending[key] = obj
+
+    def dirty(self):
+        """returns the keys of the objects changed since the last save"""
+        return frozenset(self.__pending)
+
+    def save(self):
+        """appends the changed objects to the segment file
+
+        In write-behind mode, the objects changed by all the saves made
+        within the HBNB_WRITE_BEHIND window are appended together.
+        """
+        if self.__committer is not None:
+            self.__committer.request()
+        else:
+            self.__append()
+
+    def flush(self):
+        """waits until everything saved so far is in the segment file"""
+        if self.__committer is not None:
+            self.__committer.flush()
+
+    def __append(self):
+        """appends the objects changed since the last save"""
+        with self._lock:
+            if not self.__pending:
+                return
+            pending = self.__pending
+            lines = []
+            for key, obj in pending.items():
+                record = None if obj is None else obj.to_dict(fs=True)
+                lines.append((key, (json.dumps([key, record]) +
+                                    "\n").encode()))
+            with self.__locked(fcntl.LOCK_EX):
+                self.__refresh()
+                fd = self.__open_segment()
+                offset = os.fstat(fd).st_size
+                os.write(fd, b"".join(line for key, line in lines))
+                os.fsync(fd)
+                for key, line in lines:
+                    old = self.__locate(key)
+                    if old is not None:
+                        self.__garbage += old[1]
+                    if pending[key] is None:
+                        self.__garbage += len(line)
+                        self.__delta[key] = None
+                    else:
+                        self.__delta[key] = (offset, len(line))
+                        self.__remember(key, pending[key])
+                    offset += len(line)
+                self.__seen = offset
+                self.__pending = {}
+                if self.__garbage > offset // 2 and offset > 1 << 20:
+                    self.__compact()
+                elif len(self.__delta) > self.__merge_after:
+                    self.__merge()
+
+    def reload(self):
+        """opens the index and indexes the records appended since"""
+        with self._lock, self.__locked(fcntl.LOCK_SH):
+            self.__refresh()
+
+    def __refresh(self):
+        """reopens the index if another process merged or compacted it
+        and indexes the records appended since; the lock file is held"""
+        identity = self.__stat(self.__file_path + ".idx")
+        if identity == self.__identity:
+            self.__catch_up()
+            return
+        index = Index(self.__file_path + ".idx")
+        if index.generation != self.__index.generation:
+            self.__garbage = 0
+        self.__index.close()
+        self.__index = index
+        self.__identity = identity
+        if self.__segment is not None:
+            os.close(self.__segment)
+            self.__segment = None
+        self.__cache.clear()
+        self.__delta = {}
+        self.__seen = index.covered
+        self.__catch_up()
+        counts = {}
+        for name in classes:
+            start, stop = index.span(name + ".")
+            counts[name] = stop - start
+        self.__counts = counts
+        for key, location in self.__delta.items():
+            self.__count(key, (location is not None) -
+                         (index.find(key) is not None))
+        for key, obj in self.__pending.items():
+            self.__count(key, (obj is not None) -
+                         (self.__locate(key) is not None))
+
+    def close(self):
+        """picks up the records written by others since the last reload"""
+        self.reload()
+
+    def get(self, cls, id):
+        """returns the object of class cls with the given id or None"""
+        if cls is None or id is None:
+            return None
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.load("{}.{}".format(cls, id))
+
+    def children(self, cls, attr, id):
+        """returns the objects of class cls whose attribute attr is id, or
+        holds id when it is a list of ids"""
+        objs = []
+        for obj in self.all(cls).values():
+            value = getattr(obj, attr, None)
+            if value == id or isinstance(value, list) and id in value:
+                objs.append(obj)
+        return objs
+
+    def find_places(self, city_ids=None, ranges=None):
+        """returns the places in one of city_ids, when given, whose numeric
+        attributes are within ranges: {attribute: (low, high)}"""
+        return [obj for obj in self.all("Place").values()
+                if matches(obj, city_ids, ranges)]
+
+    def query(self, cls):
+        """returns a Query on the objects of class cls"""
+        return Query(self, cls)
+
+    def select(self, query):
+        """returns an iterator over the objects query asks for, read
+        from the segment as they are checked"""
+        for attr, op, value in query.conditions:
+            if attr == "id" and op == "eq":
+                obj = self.get(query.name, value)
+                return query.arrange([] if obj is None else [obj])
+        return query.arrange(self.all(query.name).values())
+
+    def count(self, cls=None):
+        """returns the number of objects, of the class cls if given"""
+        if cls is None:
+            return sum(self.__counts.values())
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.__counts.get(cls, 0)
+
+    def compact(self):
+        """rewrites the live records into a new segment without garbage
+
+        The new segment and its index are written side by side in key
+        order; renaming the index over the old one switches to them.
+        """
+        with self._lock, self.__locked(fcntl.LOCK_EX):
+            self.__refresh()
+            self.__compact()
+
+    def __compact(self):
+        """rewrites the live records into a new segment; the lock file
+        is held, so no other process appends to the old one meanwhile"""
+        self.__merge()
+        old = self.__index
+        generation = old.generation + 1
+        path = self.__file_path + ".idx"
+        src = self.__open_segment()
+        dst = os.open(self.__segment_path(generation),
+                      os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        offset = 0
+        with open(path + ".tmp", "wb") as f:
+            f.write(header.pack(magic, generation, 0, 0))
+            for i in range(len(old)):
+                location = old.location(i)
+                data = os.pread(src, location[1], location[0])
+                os.write(dst, data)
+                f.write(entry.pack(old.key(i).encode(), offset,
+                                   len(data)))
+                offset += len(data)
+            f.seek(0)
+            f.write(header.pack(magic, generation, offset, len(old)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.fsync(dst)
+        os.close(dst)
+        os.replace(path + ".tmp", path)
+        os.close(src)
+        self.__segment = None
+        old.close()
+        self.__index = Index(path)
+        self.__identity = self.__stat(path)
+        self.__seen = offset
+        self.__garbage = 0
+        os.remove(self.__segment_path(generation - 1))
+
+    def load(self, key):
+        """returns the object stored under key, reading it if needed"""
+        with self._lock:
+            if key in self.__pending:
+                return self.__pending[key]
+            obj = self.__cache.get(key)
+            if obj is not None:
+                self.__cache.move_to_end(key)
+                return obj
+            location = self.__locate(key)
+            if location is None:
+                return None
+            data = os.pread(self.__open_segment(), location[1], location[0])
+            record = json.loads(data)[1]
+            self.__quiet = True
+            try:
+                obj = classes[record["__class__"]].from_storage(record)
+            finally:
+                self.__quiet = False
+            self.__remember(key, obj)
+            return obj
+
+    def exists(self, key):
+        """returns True if an object is stored under key"""
+        with self._lock:
+            if key in self.__pending:
+                return self.__pending[key] is not None
+            return key in self.__cache or self.__locate(key) is not None
+
+    def keys(self, prefix=""):
+        """iterates over the keys of the stored objects starting with prefix
+
+        Keys are read from the index in batches, so objects added or
+        removed while iterating may or may not be seen.
+        """
+        last = None
+        while True:
+            with self._lock:
+                index = self.__index
+                start, stop = index.span(prefix)
+                if last is not None:
+                    start = index.bisect(last)
+                    if start < stop and index.key(start) == last:
+                        start += 1
+                batch = [index.key(i)
+                         for i in range(start, min(start + 1000, stop))]
+                if not batch:
+                    break
+                last = batch[-1]
+                batch = [key for key in batch if self.exists(key)]
+            for key in batch:
+                yield key
+        with self._lock:
+            extra = set(key for key in list(self.__delta) +
+                        list(self.__pending)
+                        if key.startswith(prefix) and
+                        self.__index.find(key) is None and self.exists(key))
+        for key in sorted(extra):
+            yield key
+
+    def __remember(self, key, obj):
+        """caches obj under key, evicting the least recently used"""
+        self.__cache[key] = obj
+        self.__cache.move_to_end(key)
+        while len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
+
+    def __count(self, key, delta):
+        """adjusts the number of live objects of the class of key"""
+        name = key.split(".", 1)[0]
+        self.__counts[name] = self.__counts.get(name, 0) + delta
+
+    def __locate(self, key):
+        """returns the (offset, length) of the saved record of key"""
+        if key in self.__delta:
+            return self.__delta[key]
+        return self.__index.find(key)
+
+    def __catch_up(self):
+        """indexes the records appended to the segment after __seen"""
+        try:
+            f = open(self.__segment_path(self.__index.generation), "rb")
+        except OSError:
+            return
+        with f:
+            f.seek(self.__seen)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    key, record = json.loads(line)
+                except ValueError:
+                    break
+                if key not in self.__pending:
+                    self.__count(key, (record is not None) -
+                                 (self.__locate(key) is not None))
+                if record is None:
+                    self.__delta[key] = None
+                else:
+                    self.__delta[key] = (self.__seen, len(line))
+                self.__cache.pop(key, None)
+                self.__seen += len(line)
+
+    def __merge(self):
+        """writes a new index with the delta merged in"""
+        index = self.__index
+        delta = sorted(self.__delta.items())
+        path = self.__file_path + ".idx"
+        size = 0
+        with open(path + ".tmp", "wb") as f:
+            f.write(header.pack(magic, index.generation, 0, 0))
+            i, j = 0, 0
+            while i < len(index) or j < len(delta):
+                key = index.key(i) if i < len(index) else None
+                if j < len(delta) and (key is None or delta[j][0] <= key):
+                    if delta[j][0] == key:
+                        i += 1
+                    key, location = delta[j]
+                    j += 1
+                else:
+                    location = index.location(i)
+                    i += 1
+                if location is not None:
+                    f.write(entry.pack(key.encode(), *location))
+                    size += 1
+            f.seek(0)
+            f.write(header.pack(magic, index.generation, self.__seen, size))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        index.close()
+        self.__index = Index(path)
+        self.__identity = self.__stat(path)
+        self.__delta = {}
+
+    def __open_segment(self):
+        """returns the file descriptor of the current segment file"""
+        if self.__segment is None:
+            self.__segment = os.open(
+                self.__segment_path(self.__index.generation),
+                os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        return self.__segment
+
+    @contextmanager
+    def __locked(self, operation):
+        """holds the lock file next to the segment files locked with
+        operation, or nothing when it cannot be opened, e.g. in a
+        read-only directory"""
+        try:
+            fd = os.open(self.__file_path + ".lock",
+                         os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(fd, operation)
+            yield
+        finally:
+            os.close(fd)
+
+    def __segment_path(self, generation):
+        """returns the path of the segment file of generation"""
+        return "{}.{}".format(self.__file_path, generation)
+
+    def __stat(self, path):
+        """returns the (inode, size, mtime) of path or None if missing"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from os import getenv
+from sqlalchemy import create_engine, event
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with an embedded SQLite database
+
+    Uses the same table mappings as DBStorage. The database lives in the
+    file set by HBNB_SQLITE_PATH (hbnb.db by default) and is opened in
+    WAL mode, so readers are not blocked by a writer, with foreign keys
+    enforced as on MySQL.
+    """
+
+    def _connect(self):
+        """returns the engine of the SQLite database at HBNB_SQLITE_PATH"""
+        path = getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        return self._engine('sqlite:///{}'.format(path))
+
+    def _engine(self, url):
+        """returns the engine of the SQLite database at url, opened with
+        the pragmas of every connection set"""
+        engine = create_engine(url)
+        event.listen(engine, "connect", self.__configure)
+        return engine
+
+    def __configure(self, connection, record):
+        """sets the pragmas of every new connection to the database"""
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    def _estimates(self):
+        """returns None: SQLite keeps no row counts of its own, so counts
+        are always exact, only read less often with max_age"""
+        return None
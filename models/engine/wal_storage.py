@@ -0,0 +1,283 @@
+#!/usr/bin/python3
+"""
+Contains the WALStorage class
+"""
+
+from contextlib import contextmanager
+import fcntl
+import json
+import os
+import threading
+from models.engine.file_storage import FileStorage, classes
+from models.engine.group_commit import GroupCommit
+
+
+class WALStorage(FileStorage):
+    """keeps objects in a JSON snapshot plus an append-only change log
+
+    save() appends one line per object created, updated or deleted
+    since the last save to the log instead of rewriting the whole file.
+    Once the log holds more records than the snapshot, it is folded into
+    a new snapshot by a background thread. reload() replays the snapshot
+    and the log tail.
+
+    Processes sharing the files take turns through a lock file next to
+    the log: appends, log rotations and snapshot swaps hold it exclusive,
+    replays hold it shared. A process whose log was rotated by another
+    one reopens it before its next append.
+    """
+
+    # string - path to the JSON snapshot, same format as FileStorage's
+    __file_path = "file.json"
+    # string - path to the log of changes made since the snapshot
+    __log_path = "file.json.log"
+    # integer - minimum number of log records before compacting
+    __compact_after = 1000
+    # the snapshot is always JSON, so it can't be converted
+    convert = None
+
+    def __init__(self):
+        """Instantiate a WALStorage object"""
+        # dictionary - the last record persisted for every live key
+        self.__written = {}
+        # tuple - identity of the snapshot and the log that were replayed
+        self.__replayed = None
+        # integer - offset in the log up to which records were applied
+        self.__offset = 0
+        # integer - number of records in the log(s) not in the snapshot
+        self.__appended = 0
+        self.__log = None
+        self.__compactor = None
+        self.__lock = threading.RLock()
+        self.__committer = GroupCommit.from_env(self.__append)
+
+    def save(self):
+        """appends a log record for every object changed since last save
+
+        In write-behind mode, the records of all the saves made within
+        the HBNB_WRITE_BEHIND window are appended together.
+        """
+        if self.__committer is not None:
+            self.__committer.request()
+        else:
+            self.__append()
+
+    def flush(self):
+        """waits until everything saved so far is in the log"""
+        if self.__committer is not None:
+            self.__committer.flush()
+
+    def __append(self):
+        """appends the records of the objects changed since last save"""
+        with self.__lock:
+            written = self.__written
+            lines = []
+            for key in self._clean():
+                obj = self.get(*key.split(".", 1))
+                if obj is None:
+                    if written.pop(key, None) is not None:
+                        lines.append(json.dumps({"op": "delete",
+                                                 "key": key}))
+                    continue
+                record = obj.to_dict(fs=True)
+                if record != written.get(key):
+                    written[key] = record
+                    lines.append(json.dumps({"op": "set", "key": key,
+                                             "value": record}))
+            if not lines:
+                return
+            with self.__locked(fcntl.LOCK_EX):
+                self.__open_log()
+                identity = self.__identity()
+                replayed = self.__replayed
+                caught_up = replayed is not None and \
+                    identity[:2] == replayed[:2] and \
+                    replayed[2] in (None, identity[2]) and \
+                    self.__log.seek(0, os.SEEK_END) == self.__offset
+                self.__log.write(("\n".join(lines) + "\n").encode())
+                self.__log.flush()
+                os.fsync(self.__log.fileno())
+                if caught_up:
+                    self.__offset = self.__log.tell()
+                    self.__replayed = identity
+                self.__appended += len(lines)
+                if self.__appended > max(self.__compact_after,
+                                         len(written)):
+                    self.__rotate()
+
+    def __open_log(self):
+        """opens the live log for appending, again when another process
+        rotated it since it was opened"""
+        if self.__log is not None:
+            st = self.__stat(self.__log_path)
+            if st is None or st[0] != os.fstat(self.__log.fileno()).st_ino:
+                self.__log.close()
+                self.__log = None
+        if self.__log is None:
+            self.__log = open(self.__log_path, "ab")
+
+    @contextmanager
+    def __locked(self, operation):
+        """holds the lock file next to __log_path locked with operation,
+        or nothing when it cannot be opened, e.g. in a read-only
+        directory"""
+        try:
+            fd = os.open(self.__log_path + ".lock",
+                         os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(fd, operation)
+            yield
+        finally:
+            os.close(fd)
+
+    def reload(self):
+        """replays the snapshot and the log into __objects
+
+        When the snapshot and the log are the ones replayed last time,
+        only the records appended to the log since then are applied.
+        """
+        with self.__lock, self.__locked(fcntl.LOCK_SH):
+            identity = self.__catch_up()
+        if identity is not None and identity[1] is not None:
+            self.compact(wait=True)
+
+    def __catch_up(self):
+        """applies what the other processes wrote since the last replay,
+        and returns the identity of the files when they all had to be
+        replayed, None when only the tail of the live log was new"""
+        identity = self.__identity()
+        if identity == self.__replayed:
+            self.__offset = self.__replay(self.__log_path, self.__offset)
+            return None
+        if self.__replayed is not None and self.__compacting():
+            return None
+        try:
+            with open(self.__file_path, "r") as f:
+                snapshot = json.load(f)
+        except Exception:
+            snapshot = {}
+        for key in self.__written.keys() - snapshot.keys():
+            self.__apply({"op": "delete", "key": key})
+        for key, record in snapshot.items():
+            self.__apply({"op": "set", "key": key, "value": record})
+        self.__appended = 0
+        self.__replay(self.__log_path + ".old", 0)
+        self.__offset = self.__replay(self.__log_path, 0)
+        self.__replayed = identity
+        return identity
+
+    def compact(self, wait=False):
+        """folds the log into a new snapshot in a background thread
+
+        The live log is set aside and a fresh one is started, so saves
+        can go on while the snapshot is written. If wait is True, the
+        snapshot is written before returning.
+        """
+        with self.__lock:
+            with self.__locked(fcntl.LOCK_EX):
+                self.__rotate()
+            compactor = self.__compactor
+        if wait:
+            compactor.join()
+
+    def __rotate(self):
+        """sets the live log aside and starts writing the snapshot, unless
+        a compaction is running already; the lock file is held
+
+        The records other processes appended are applied first, so that
+        the snapshot holds everything in the log set aside.
+        """
+        if self.__compacting():
+            return
+        self.__catch_up()
+        old_log = self.__log_path + ".old"
+        if self.__log is not None:
+            self.__log.close()
+        if not os.path.exists(old_log) and os.path.exists(self.__log_path):
+            os.replace(self.__log_path, old_log)
+        self.__log = open(self.__log_path, "ab")
+        self.__appended = 0
+        self.__offset = 0
+        self.__compactor = threading.Thread(
+            target=self.__write_snapshot,
+            args=(dict(self.__written), old_log), daemon=True)
+        self.__compactor.start()
+
+    def __compacting(self):
+        """returns True while a background compaction is running"""
+        return self.__compactor is not None and self.__compactor.is_alive()
+
+    def __write_snapshot(self, records, old_log):
+        """writes records as the new snapshot and drops the old log"""
+        tmp_path = self.__file_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(records, f)
+            f.flush()
+            os.fsync(f.fileno())
+        with self.__locked(fcntl.LOCK_EX):
+            os.replace(tmp_path, self.__file_path)
+            if os.path.exists(old_log):
+                os.remove(old_log)
+            identity = self.__identity()
+        with self.__lock:
+            self.__replayed = identity
+
+    def __replay(self, path, offset):
+        """applies the records of the log at path from offset on
+
+        Returns the offset just after the last complete record. A torn
+        record at the end of the log is left for a later replay.
+        """
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return offset
+        with f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    self.__apply(json.loads(line))
+                except Exception:
+                    pass
+                self.__appended += 1
+                offset += len(line)
+        return offset
+
+    def __apply(self, entry):
+        """applies one log record to __objects"""
+        key = entry["key"]
+        obj = self.get(*key.split(".", 1))
+        if entry["op"] == "delete":
+            self.__written.pop(key, None)
+            if obj is not None:
+                self.delete(obj)
+                self._clean([key])
+        elif entry["value"] != self.__written.get(key) or obj is None:
+            value = entry["value"]
+            self.__written[key] = value
+            self.new(classes[value["__class__"]].from_storage(value))
+            self._clean([key])
+
+    def __identity(self):
+        """returns the identity of the snapshot, old log and live log
+
+        The live log is identified by its inode only: it grows with every
+        save and its new records are picked up from the replay offset.
+        """
+        log = self.__stat(self.__log_path)
+        return (self.__stat(self.__file_path),
+                self.__stat(self.__log_path + ".old"),
+                log and log[0])
+
+    def __stat(self, path):
+        """returns the (inode, size, mtime) of path or None if missing"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
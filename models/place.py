@@ -16,15 +16,19 @@ if models.storage_t == 'db':
                           Column('amenity_id', String(60),
                                  ForeignKey('amenities.id', onupdate='CASCADE',
                                             ondelete='CASCADE'),
-                                 primary_key=True))
+                                 primary_key=True, index=True))
 
 
 class Place(BaseModel, Base):
     """Representation of Place """
     if models.storage_t == 'db':
         __tablename__ = 'places'
-        city_id = Column(String(60), ForeignKey('cities.id'), nullable=False)
-        user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
+        city_id = Column(String(60),
+                         ForeignKey('cities.id', ondelete='CASCADE'),
+                         nullable=False, index=True)
+        user_id = Column(String(60),
+                         ForeignKey('users.id', ondelete='CASCADE'),
+                         nullable=False, index=True)
         name = Column(String(128), nullable=False)
         description = Column(String(1024), nullable=True)
         number_rooms = Column(Integer, nullable=False, default=0)
@@ -33,7 +37,8 @@ class Place(BaseModel, Base):
         price_by_night = Column(Integer, nullable=False, default=0)
         latitude = Column(Float, nullable=True)
         longitude = Column(Float, nullable=True)
-        reviews = relationship("Review", backref="place")
+        reviews = relationship("Review", backref="place",
+                               cascade="all, delete", passive_deletes=True)
         amenities = relationship("Amenity", secondary="place_amenity",
                                  backref="place_amenities",
                                  viewonly=False)
@@ -53,26 +58,44 @@ class Place(BaseModel, Base):
     def __init__(self, *args, **kwargs):
         """initializes Place"""
         super().__init__(*args, **kwargs)
+        if models.storage_t != 'db':
+            self.amenity_ids = list(self.amenity_ids)
+
+    if models.storage_t == 'db':
+        @property
+        def amenity_ids(self):
+            """getter for the list of ids of the amenities of the place"""
+            return [amenity.id for amenity in self.amenities]
+
+        @amenity_ids.setter
+        def amenity_ids(self, amenity_ids):
+            """setter linking the place to the amenities of amenity_ids
+            only, through the storage; unknown ids are skipped"""
+            from models.amenity import Amenity
+            amenities = models.storage.get_many(Amenity, amenity_ids)
+            for amenity in list(self.amenities):
+                if amenity.id not in amenities:
+                    models.storage.unlink(self, amenity)
+            for amenity in amenities.values():
+                models.storage.link(self, amenity)
+    else:
+        def _restore(self, attrs):
+            """sets the attributes attrs, with a list of amenity ids of
+            its own"""
+            if "amenity_ids" in attrs:
+                attrs["amenity_ids"] = list(attrs["amenity_ids"])
+            super()._restore(attrs)
 
-    if models.storage_t != 'db':
         @property
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return models.storage.children(Review, "place_id", self.id)
 
         @property
         def amenities(self):
             """getter attribute returns the list of Amenity instances"""
             from models.amenity import Amenity
-            amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
-                    amenity_list.append(amenity)
-            return amenity_list
+            amenities = (models.storage.get(Amenity, amenity_id)
+                         for amenity_id in self.amenity_ids)
+            return [amenity for amenity in amenities if amenity is not None]
@@ -17,8 +17,10 @@ class User(BaseModel, Base):
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
         last_name = Column(String(128), nullable=True)
-        places = relationship("Place", backref="user")
-        reviews = relationship("Review", backref="user")
+        places = relationship("Place", backref="user",
+                              cascade="all, delete", passive_deletes=True)
+        reviews = relationship("Review", backref="user",
+                               cascade="all, delete", passive_deletes=True)
     else:
         email = ""
         password = ""
@@ -31,3 +33,16 @@ class User(BaseModel, Base):
             kwargs['password'] = hashlib.md5(
                 kwargs['password'].encode()).hexdigest()
         super().__init__(*args, **kwargs)
+
+    if models.storage_t != 'db':
+        @property
+        def places(self):
+            """getter for list of place instances owned by the user"""
+            from models.place import Place
+            return models.storage.children(Place, "user_id", self.id)
+
+        @property
+        def reviews(self):
+            """getter for list of review instances written by the user"""
+            from models.review import Review
+            return models.storage.children(Review, "user_id", self.id)
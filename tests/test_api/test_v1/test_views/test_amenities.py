@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Contains the TestAmenitiesDocs and TestAmenitiesViews classes
+"""
+
+from api.v1.app import app
+from api.v1.views import amenities
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestAmenitiesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the amenities views"""
+    def test_pep8_conformance_amenities(self):
+        """Test that api/v1/views/amenities.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/amenities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_amenities(self):
+        """Test that tests/test_api/test_v1/test_views/test_amenities.py
+        conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_amenities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_amenities_module_docstring(self):
+        """Test for the amenities.py module docstring"""
+        self.assertIsNot(amenities.__doc__, None,
+                         "amenities.py needs a docstring")
+        self.assertTrue(len(amenities.__doc__) >= 1,
+                        "amenities.py needs a docstring")
+
+
+class TestAmenitiesViews(unittest.TestCase):
+    """Test the amenities views through the test client of the API"""
+    def setUp(self):
+        """Stores an amenity offered by one of two places"""
+        self.client = app.test_client()
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        user = User(email="host@hbnb.io", password="pwd")
+        wifi = Amenity(name="Wifi")
+        loft = Place(name="Loft", city_id=city.id, user_id=user.id)
+        cabin = Place(name="Cabin", city_id=city.id, user_id=user.id)
+        self.stored = [(type(obj).__name__, obj.id) for obj in
+                       (loft, cabin, wifi, user, city, state)]
+        for obj in (state, city, user, wifi, loft, cabin):
+            storage.new(obj)
+        storage.link(loft, wifi)
+        storage.save()
+        storage.close()
+        self.wifi = wifi.id
+
+    def tearDown(self):
+        """Deletes what the test stored"""
+        for cls, obj_id in self.stored:
+            storage.delete(storage.get(cls, obj_id))
+        storage.save()
+        storage.close()
+
+    def test_places_of_amenity(self):
+        """Test the places of an amenity are the places offering it"""
+        response = self.client.get("/api/v1/amenities/{}/places".format(
+            self.wifi))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([place["name"] for place in response.get_json()],
+                         ["Loft"])
+
+    def test_places_of_unlinked_amenity(self):
+        """Test no place offers an amenity once it is unlinked"""
+        place = storage.get("Place", self.stored[0][1])
+        storage.unlink(place, storage.get("Amenity", self.wifi))
+        storage.save()
+        storage.close()
+        response = self.client.get("/api/v1/amenities/{}/places".format(
+            self.wifi))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+
+    def test_places_of_missing_amenity(self):
+        """Test the places of an amenity that does not exist are a 404"""
+        response = self.client.get("/api/v1/amenities/{}/places".format(
+            "missing"))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json(), {"error": "Not found"})
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlacesViews classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the places views"""
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places(self):
+        """Test that tests/test_api/test_v1/test_views/test_places.py
+        conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertIsNot(places.__doc__, None,
+                         "places.py needs a docstring")
+        self.assertTrue(len(places.__doc__) >= 1,
+                        "places.py needs a docstring")
+
+
+class TestPlacesViews(unittest.TestCase):
+    """Test the places views through the test client of the API"""
+    def setUp(self):
+        """Stores a city, a user and two amenities to place things in"""
+        self.client = app.test_client()
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        user = User(email="host@hbnb.io", password="pwd")
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        self.ids = {"state": state.id, "city": city.id, "user": user.id,
+                    "wifi": wifi.id, "pool": pool.id}
+        for obj in (state, city, user, wifi, pool):
+            storage.new(obj)
+        storage.save()
+        storage.close()
+        self.places = []
+
+    def tearDown(self):
+        """Deletes what the test stored"""
+        stored = [("Place", place_id) for place_id in self.places] + [
+            ("Amenity", self.ids["wifi"]), ("Amenity", self.ids["pool"]),
+            ("User", self.ids["user"]), ("City", self.ids["city"]),
+            ("State", self.ids["state"])]
+        for cls, obj_id in stored:
+            storage.delete(storage.get(cls, obj_id))
+        storage.save()
+        storage.close()
+
+    def create(self, **kwargs):
+        """Creates a place through the API, returns its JSON"""
+        kwargs.setdefault("name", "Loft")
+        kwargs["user_id"] = self.ids["user"]
+        response = self.client.post("/api/v1/cities/{}/places".format(
+            self.ids["city"]), json=kwargs)
+        self.assertEqual(response.status_code, 201)
+        self.places.append(response.get_json()["id"])
+        return response.get_json()
+
+    def amenities(self, place_id):
+        """returns the sorted names of the amenities of a place"""
+        response = self.client.get("/api/v1/places/{}/amenities".format(
+            place_id))
+        self.assertEqual(response.status_code, 200)
+        return sorted(amenity["name"] for amenity in response.get_json())
+
+    def test_create_with_amenity_ids(self):
+        """Test a place created with amenity_ids offers those amenities"""
+        place = self.create(amenity_ids=[self.ids["wifi"]])
+        self.assertEqual(self.amenities(place["id"]), ["Wifi"])
+
+    def test_update_amenity_ids(self):
+        """Test updating amenity_ids replaces the amenities of a place"""
+        place = self.create(amenity_ids=[self.ids["wifi"]])
+        response = self.client.put("/api/v1/places/{}".format(place["id"]),
+                                   json={"amenity_ids": [self.ids["pool"]],
+                                         "max_guest": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["max_guest"], 3)
+        self.assertEqual(self.amenities(place["id"]), ["Pool"])
+
+    def search(self, body):
+        """returns the sorted names of the places places_search finds"""
+        response = self.client.post("/api/v1/places_search", json=body)
+        self.assertEqual(response.status_code, 200)
+        return sorted(place["name"] for place in response.get_json())
+
+    def test_search_ranges(self):
+        """Test places_search keeps the places within the given ranges"""
+        self.create(name="Cheap", price_by_night=50, max_guest=2)
+        self.create(name="Mid", price_by_night=120, max_guest=4)
+        self.create(name="Dear", price_by_night=300, max_guest=8)
+        city = {"cities": [self.ids["city"]]}
+        self.assertEqual(self.search(dict(city, price_by_night=[100, 300])),
+                         ["Dear", "Mid"])
+        self.assertEqual(self.search(dict(city, price_by_night=[None, 120],
+                                          max_guest=[3, None])), ["Mid"])
+        self.assertEqual(self.search(dict(city, max_guest=[9, None])), [])
+
+    def test_search_bad_range(self):
+        """Test places_search rejects a range that is not two numbers"""
+        for bounds in ("cheap", [1], [1, "2"], [True, None]):
+            response = self.client.post("/api/v1/places_search",
+                                        json={"price_by_night": bounds})
+            self.assertEqual(response.status_code, 400)
@@ -137,6 +137,35 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_to_dict_cache(self):
+        """Test that to_dict returns copies of a dictionary kept until an
+        attribute is written"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        first = inst.to_dict()
+        first["name"] = "changed"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+        inst.name = "Betty"
+        self.assertEqual(inst.to_dict()["name"], "Betty")
+        self.assertEqual(inst.to_dict()["updated_at"],
+                         inst.updated_at.strftime("%Y-%m-%dT%H:%M:%S.%f"))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_to_dict_cache_bounded(self):
+        """Test that only the HBNB_SERIALIZED_CACHE instances most
+        recently serialized keep their dictionary"""
+        with mock.patch.object(models.base_model, "serialized_size", 2):
+            insts = [BaseModel() for i in range(3)]
+            for inst in insts:
+                inst.to_dict()
+            insts[1].to_dict()
+            self.assertEqual(len(models.base_model.serialized), 2)
+            self.assertIsNone(models.base_model.recall(insts[0]))
+            self.assertIsNotNone(models.base_model.recall(insts[1]))
+            self.assertIsNotNone(models.base_model.recall(insts[2]))
+            self.assertEqual(insts[0].to_dict()["id"], insts[0].id)
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -157,3 +186,27 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @mock.patch('models.storage')
+    def test_setattr_marks_dirty(self, mock_storage):
+        """Test that writing an attribute flags the instance in storage"""
+        inst = BaseModel()
+        mock_storage.reset_mock()
+        inst.name = "Holberton"
+        mock_storage.mark_dirty.assert_called_once_with(inst, "name")
+
+    @mock.patch('models.storage')
+    def test_from_storage(self, mock_storage):
+        """Test that from_storage rebuilds a saved instance as is, without
+        flagging it in storage"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        record = inst.to_dict()
+        mock_storage.reset_mock()
+        read = BaseModel.from_storage(record)
+        self.assertEqual(read.__dict__, inst.__dict__)
+        self.assertEqual(record["__class__"], "BaseModel")
+        self.assertFalse(mock_storage.mark_dirty.called)
+        new = BaseModel.from_storage({"__class__": "BaseModel"})
+        self.assertEqual(type(new.id), str)
+        self.assertEqual(type(new.created_at), datetime)
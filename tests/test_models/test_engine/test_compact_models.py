@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompactModelsDocs and TestCompactModels classes
+"""
+
+from datetime import datetime
+import inspect
+import models
+from models.engine import compact_models
+from models.place import Place
+from models.review import Review
+from models.user import User
+import pep8
+import sys
+import unittest
+Compact = compact_models.Compact
+
+
+class TestCompactModelsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Compact class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cm_f = inspect.getmembers(Compact, inspect.isfunction)
+
+    def test_pep8_conformance_compact_models(self):
+        """Test that models/engine/compact_models.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/compact_models.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_compact_models(self):
+        """Test tests/test_models/test_compact_models.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_compact_models.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compact_models_module_docstring(self):
+        """Test for the compact_models.py module docstring"""
+        self.assertIsNot(compact_models.__doc__, None,
+                         "compact_models.py needs a docstring")
+        self.assertTrue(len(compact_models.__doc__) >= 1,
+                        "compact_models.py needs a docstring")
+
+    def test_compact_class_docstring(self):
+        """Test for the Compact class docstring"""
+        self.assertIsNot(Compact.__doc__, None,
+                         "Compact class needs a docstring")
+        self.assertTrue(len(Compact.__doc__) >= 1,
+                        "Compact class needs a docstring")
+
+    def test_cm_func_docstrings(self):
+        """Test for the presence of docstrings in Compact methods"""
+        for func in self.cm_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestCompactModels(unittest.TestCase):
+    """Test the compact twins of the models"""
+    def test_twin(self):
+        """Test that a twin is a cached, slotted subclass of the model"""
+        twin = compact_models.compact(Review, ("place_id", "user_id"))
+        self.assertIs(compact_models.compact(Review), twin)
+        self.assertTrue(issubclass(twin, Review))
+        self.assertEqual(twin.__name__, "Review")
+        self.assertIn("place_id", twin.__slots__)
+
+    def test_same_attributes(self):
+        """Test that a twin reads back the record it was built from"""
+        place = Place(city_id="c", name="Loft", number_rooms=2,
+                      amenity_ids=["a"])
+        place.pool = True
+        twin = compact_models.compact(Place, ("city_id", "amenity_ids"))
+        read = twin(**place.to_dict())
+        self.assertEqual(read.to_dict(), place.to_dict())
+        self.assertTrue(str(read).startswith(
+            "[Place] ({}) {{".format(place.id)))
+        self.assertIn("'pool': True", str(read))
+        self.assertEqual(read.id, place.id)
+        self.assertEqual(read.updated_at, place.updated_at)
+        self.assertEqual(read.max_guest, 0)
+        self.assertTrue(read.pool)
+        self.assertNotIn("max_guest", read.to_dict())
+        with self.assertRaises(AttributeError):
+            read.missing
+
+    def test_not_kept_serialized(self):
+        """Test that to_dict keeps no dictionary of a twin"""
+        twin = compact_models.compact(Review, ("place_id", "user_id"))
+        review = twin(text="Great")
+        self.assertEqual(review.to_dict()["text"], "Great")
+        self.assertIsNone(models.base_model.recall(review))
+        plain = Review(text="Great")
+        plain.to_dict()
+        self.assertIsNotNone(models.base_model.recall(plain))
+
+    def test_compact_form(self):
+        """Test that ids and timestamps are packed and foreign keys are
+        interned"""
+        twin = compact_models.compact(Review, ("place_id", "user_id"))
+        review = twin(place_id="".join(["place", "-", "1"]))
+        self.assertEqual(len(review._id), 16)
+        self.assertIs(type(review._created_at), int)
+        self.assertIs(type(review.created_at), datetime)
+        self.assertIs(review.place_id, sys.intern("place-1"))
+        review.id = "not a uuid"
+        self.assertEqual(review.id, "not a uuid")
+
+    def test_user_password(self):
+        """Test that a twin of User still hashes the password it is given"""
+        twin = compact_models.compact(User)
+        user = twin(email="a@b.c", password="secret")
+        self.assertEqual(user.password,
+                         User(password="secret").password)
+        self.assertNotIn("password", user.to_dict())
+        self.assertIn("password", user.to_dict(fs=True))
+
+    def test_from_storage(self):
+        """Test that a twin read from storage is packed and interned"""
+        place = Place(city_id="c", amenity_ids=["a"])
+        twin = compact_models.compact(Place, ("city_id", "amenity_ids"))
+        read = twin.from_storage(place.to_dict())
+        self.assertEqual(read.to_dict(), place.to_dict())
+        self.assertIs(type(read._created_at), int)
+        self.assertIs(read.amenity_ids[0], sys.intern("a"))
+        self.assertIsNot(read.amenity_ids, place.amenity_ids)
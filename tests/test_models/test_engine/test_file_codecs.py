@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Contains the TestFileCodecsDocs and TestFileCodecs classes
+"""
+
+import inspect
+from models.engine import file_codecs
+import pep8
+import unittest
+
+
+class TestFileCodecsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the codecs"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.codec_classes = inspect.getmembers(file_codecs, inspect.isclass)
+
+    def test_pep8_conformance_file_codecs(self):
+        """Test that models/engine/file_codecs.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/file_codecs.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_file_codecs(self):
+        """Test tests/test_models/test_file_codecs.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_file_codecs.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_file_codecs_module_docstring(self):
+        """Test for the file_codecs.py module docstring"""
+        self.assertIsNot(file_codecs.__doc__, None,
+                         "file_codecs.py needs a docstring")
+        self.assertTrue(len(file_codecs.__doc__) >= 1,
+                        "file_codecs.py needs a docstring")
+
+    def test_codec_docstrings(self):
+        """Test for the presence of docstrings in the codecs"""
+        for name, cls in self.codec_classes:
+            self.assertIsNot(cls.__doc__, None,
+                             "{:s} class needs a docstring".format(name))
+            for func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertIsNot(func[1].__doc__, None,
+                                 "{:s} method needs a docstring".format(
+                                     func[0]))
+
+
+class TestFileCodecs(unittest.TestCase):
+    """Test the codecs FileStorage can write its file with"""
+    records = {"State.1": {"__class__": "State", "id": "1", "name": "Ohio"},
+               "City.2": {"__class__": "City", "id": "2", "name": "Ada",
+                          "state_id": "1"}}
+
+    def test_round_trip(self):
+        """Test that joined fragments decode back to the records"""
+        for name, codec in file_codecs.codecs.items():
+            fragments = {key: codec.encode(record)
+                         for key, record in self.records.items()}
+            data = codec.join(fragments)
+            self.assertEqual(codec.decode(data), self.records, name)
+            self.assertIs(file_codecs.detect(data), codec, name)
+
+    def test_empty(self):
+        """Test that an empty file content round-trips"""
+        for codec in file_codecs.codecs.values():
+            self.assertEqual(codec.decode(codec.join({})), {})
+
+    def test_get(self):
+        """Test that get returns codecs by name and rejects others"""
+        self.assertEqual(file_codecs.get("binary").name, "binary")
+        with self.assertRaises(ValueError):
+            file_codecs.get("yaml")
@@ -6,7 +6,8 @@ Contains the TestFileStorageDocs classes
 from datetime import datetime
 import inspect
 import models
-from models.engine import file_storage
+from models.engine import file_codecs, file_storage
+from models.engine.group_commit import GroupCommit
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -15,9 +16,13 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
+import sys
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -72,11 +77,14 @@ class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
-        """Test that all returns the FileStorage.__objects attr"""
+        """Test that all returns a read-only copy of the
+        FileStorage.__objects attr"""
         storage = FileStorage()
         new_dict = storage.all()
-        self.assertEqual(type(new_dict), dict)
-        self.assertIs(new_dict, storage._FileStorage__objects)
+        self.assertEqual(dict(new_dict), storage._FileStorage__objects)
+        self.assertIs(storage.all(), new_dict)
+        with self.assertRaises(TypeError):
+            new_dict["State.1"] = None
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_new(self):
@@ -139,6 +147,59 @@ class TestGetCountFileStorage(unittest.TestCase):
             retrieved_instance = storage.get(value, "nonexistent_id")
             self.assertIsNone(retrieved_instance)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_unknown_class(self):
+        """Test that an unknown class name has no objects"""
+        storage = FileStorage()
+        storage.new(State())
+        self.assertEqual(dict(storage.all("Foo")), {})
+        self.assertEqual(list(storage.query("Foo")), [])
+        self.assertEqual(list(storage.iter("Foo")), [])
+        self.assertIsNone(storage.get("Foo", "nonexistent_id"))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_many(self):
+        """Test that get_many returns the objects found by id"""
+        storage = FileStorage()
+        states = [State(), State()]
+        for state in states:
+            storage.new(state)
+        ids = [state.id for state in states]
+        self.assertEqual(storage.get_many(State, ids + ["nonexistent_id"]),
+                         dict(zip(ids, states)))
+        self.assertEqual(storage.get_many("State", []), {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter(self):
+        """Test that iter yields the objects, skipping those deleted while
+        iterating"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            states = [State(name=str(i)) for i in range(5)]
+            city = City(name="Akron")
+            for obj in states + [city]:
+                storage.new(obj)
+            self.assertEqual(list(storage.iter(State, batch_size=2)),
+                             states)
+            self.assertCountEqual(storage.iter(), states + [city])
+            objs = storage.iter("State", batch_size=2)
+            self.assertIs(next(objs), states[0])
+            storage.delete(states[3])
+            self.assertEqual(list(objs), states[1:3] + states[4:])
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts returns the count of every class"""
+        storage = FileStorage()
+        counts = storage.counts()
+        self.assertEqual(sorted(counts), sorted(classes))
+        self.assertEqual(counts["State"], storage.count(State))
+        self.assertEqual(sum(counts.values()), storage.count())
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_count(self):
         """Test that count returns the number of objects in storage"""
@@ -161,3 +222,557 @@ class TestGetCountFileStorage(unittest.TestCase):
         for key, value in classes.items():
             count = storage.count(value)
             self.assertEqual(count, len(storage.all(value)))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_class_name_string(self):
+        """Test that all, get and count accept the class name as a string"""
+        storage = FileStorage()
+        instance = State()
+        storage.new(instance)
+        key = "State." + instance.id
+        self.assertIs(storage.get("State", instance.id), instance)
+        self.assertIn(key, storage.all("State"))
+        self.assertEqual(storage.count("State"), storage.count(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_class_view(self):
+        """Test that all(cls) is a read-only snapshot, replaced by a new
+        one when objects are added or deleted"""
+        storage = FileStorage()
+        view = storage.all(City)
+        instance = City()
+        storage.new(instance)
+        self.assertNotIn("City." + instance.id, view)
+        view = storage.all(City)
+        self.assertIn("City." + instance.id, view)
+        self.assertIs(storage.all(City), view)
+        with self.assertRaises(TypeError):
+            view["City." + instance.id] = None
+        for key in view:
+            storage.delete(instance)
+        self.assertIn("City." + instance.id, view)
+        self.assertNotIn("City." + instance.id, storage.all(City))
+        self.assertIsNone(storage.get(City, instance.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_while_writing(self):
+        """Test that iterating all() is safe while another thread adds
+        objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        for i in range(5000):
+            storage.new(State())
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        errors = []
+        done = threading.Event()
+
+        def write():
+            """Add states until the readers are done"""
+            while not done.is_set():
+                storage.new(State())
+
+        def read():
+            """Iterate the snapshots of the states and of all objects"""
+            try:
+                for i in range(20):
+                    for view in (storage.all(State), storage.all()):
+                        for key, obj in view.items():
+                            self.assertIsNotNone(obj)
+            except Exception as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=write)
+        readers = [threading.Thread(target=read) for i in range(4)]
+        writer.start()
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        done.set()
+        writer.join()
+        sys.setswitchinterval(interval)
+        FileStorage._FileStorage__objects = save
+        self.assertEqual(errors, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_buckets_follow_objects(self):
+        """Test that replacing __objects re-indexes the class buckets"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        instance = Review()
+        FileStorage._FileStorage__objects = {"Review." + instance.id: instance}
+        self.assertEqual(storage.count(Review), 1)
+        self.assertIs(storage.get(Review, instance.id), instance)
+        self.assertEqual(storage.count(State), 0)
+        FileStorage._FileStorage__objects = save
+        self.assertIsNone(storage.get(Review, instance.id))
+
+
+class TestReloadFileStorage(unittest.TestCase):
+    """Test the change detection of FileStorage.reload"""
+    def setUp(self):
+        """Point the storage to a scratch file with a single State"""
+        self.path = "test_reload_file.json"
+        self.saved = (FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__codec,
+                      FileStorage._FileStorage__pinned,
+                      FileStorage._FileStorage__sharded,
+                      FileStorage._FileStorage__compact,
+                      FileStorage._FileStorage__committer)
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.state = State(name="California")
+        self.storage.new(self.state)
+        self.storage.save()
+
+    def tearDown(self):
+        """Restore the storage and remove the scratch file"""
+        (FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__codec,
+         FileStorage._FileStorage__pinned,
+         FileStorage._FileStorage__sharded,
+         FileStorage._FileStorage__compact,
+         FileStorage._FileStorage__committer) = self.saved
+        FileStorage._FileStorage__encoded = {}
+        for path in [self.path, self.path + ".lock"] + \
+                [self.shard(name) for name in classes]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def shard(self, name):
+        """Return the path of the scratch file of class name when sharded"""
+        return self.path.replace(".json", "." + name + ".json")
+
+    def rewrite(self, records):
+        """Replace the scratch file the way another process would"""
+        with open(self.path + ".new", "w") as f:
+            json.dump(records, f)
+        os.replace(self.path + ".new", self.path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_unchanged_file(self):
+        """Test that reload keeps the objects when the file did not change"""
+        self.state.name = "Unsaved"
+        self.storage.reload()
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+        self.assertEqual(self.state.name, "Unsaved")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_applies_delta(self):
+        """Test that reload only rebuilds the records that changed"""
+        city = City(name="San Francisco", state_id=self.state.id)
+        self.storage.new(city)
+        self.storage.save()
+        with open(self.path, "r") as f:
+            records = json.load(f)
+        records["City." + city.id]["name"] = "Oakland"
+        del records["State." + self.state.id]
+        self.rewrite(records)
+        self.storage.reload()
+        reloaded = self.storage.get(City, city.id)
+        self.assertIsNot(reloaded, city)
+        self.assertEqual(reloaded.name, "Oakland")
+        self.assertIsNone(self.storage.get(State, self.state.id))
+        self.assertEqual(self.storage.count(), 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_dirty_tracking(self):
+        """Test that new, attribute writes and delete flag objects"""
+        storage = FileStorage()
+        storage.save()
+        self.assertEqual(storage.dirty(), frozenset())
+        city = City(name="Reno")
+        key = "City." + city.id
+        storage.new(city)
+        self.assertIn(key, storage.dirty())
+        storage.save()
+        self.assertNotIn(key, storage.dirty())
+        city.name = "Elko"
+        self.assertIn(key, storage.dirty())
+        storage.save()
+        storage.delete(city)
+        self.assertIn(key, storage.dirty())
+        storage.save()
+        self.assertEqual(storage.dirty(), frozenset())
+        state = State(name="Nevada")
+        state.name = "Utah"
+        self.assertNotIn("State." + state.id, storage.dirty())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_setattr_relinks_indexed_only(self):
+        """Test that only writes to indexed attributes of a stored object
+        move it in the foreign key indexes"""
+        storage = FileStorage()
+        review = Review(place_id="p1", user_id="u1", text="Good")
+        storage.new(review)
+        with mock.patch.object(FileStorage, "_FileStorage__link",
+                               autospec=True) as link:
+            review.text = "Great"
+            review.text = "Best"
+            self.assertFalse(link.called)
+            review.place_id = "p2"
+            self.assertEqual(link.call_count, 1)
+        review.place_id = "p3"
+        self.assertEqual(storage.children(Review, "place_id", "p3"),
+                         [review])
+        storage.delete(review)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reencodes_dirty_only(self):
+        """Test that save reuses the JSON text of unchanged objects"""
+        storage = FileStorage()
+        clean = City(name="Reno")
+        changed = City(name="Elko")
+        storage.new(clean)
+        storage.new(changed)
+        storage.save()
+        clean.__dict__["name"] = "Not flagged"
+        changed.name = "Ely"
+        storage.save()
+        with open(FileStorage._FileStorage__file_path, "r") as f:
+            records = json.load(f)
+        self.assertEqual(records["City." + clean.id]["name"], "Reno")
+        self.assertEqual(records["City." + changed.id]["name"], "Ely")
+        storage.delete(clean)
+        storage.delete(changed)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_builds_lazily(self):
+        """Test that reloaded records are built only when asked for"""
+        city = City(name="Oakland", state_id=self.state.id)
+        self.storage.new(city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(self.storage.count(City), 1)
+        self.assertEqual(self.storage.get(City, city.id).name, "Oakland")
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["City." + city.id])
+        self.assertIn("State." + self.state.id, self.storage.all(State))
+        self.assertEqual(self.storage.dirty(), frozenset())
+        self.storage.save()
+        with open(self.path, "r") as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_convert(self):
+        """Test that convert rewrites the file with another codec and
+        that reload reads whichever codec wrote the file"""
+        city = City(name="Oakland", state_id=self.state.id)
+        self.storage.new(city)
+        self.storage.save()
+        for name in ["binary", "gzip", "lzma", "json"]:
+            self.storage.convert(name)
+            with open(self.path, "rb") as f:
+                self.assertIs(file_codecs.detect(f.read()),
+                              file_codecs.codecs[name])
+            FileStorage._FileStorage__objects = {}
+            FileStorage._FileStorage__signature = {}
+            self.storage.reload()
+            self.assertEqual(self.storage.count(), 2)
+            self.assertEqual(self.storage.get(City, city.id).name, "Oakland")
+        with self.assertRaises(ValueError):
+            self.storage.convert("yaml")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_codec_follows_file(self):
+        """Test that saves keep the codec the file was found in"""
+        with open(self.path, "wb") as f:
+            f.write(file_codecs.codecs["gzip"].join(
+                {"State." + self.state.id:
+                 json.dumps(self.state.to_dict(fs=True))}))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.storage.get(State, self.state.id).name = "Nevada"
+        self.storage.save()
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertIs(file_codecs.detect(data), file_codecs.codecs["gzip"])
+        records = file_codecs.codecs["gzip"].decode(data)
+        self.assertEqual(records["State." + self.state.id]["name"], "Nevada")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_sharded_layout(self):
+        """Test that each class gets its own file and that saves and
+        reloads only touch the files of the classes that changed"""
+        FileStorage._FileStorage__sharded = True
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.count(State), 1)
+        city = City(name="Oakland", state_id=self.state.id)
+        self.storage.new(city)
+        self.storage.save()
+        with open(self.shard("State"), "r") as f:
+            self.assertEqual(list(json.load(f)), ["State." + self.state.id])
+        with open(self.shard("City"), "r") as f:
+            self.assertEqual(list(json.load(f)), ["City." + city.id])
+        self.assertFalse(os.path.exists(self.shard("User")))
+        state_file = os.stat(self.shard("State"))
+        city.name = "Fresno"
+        self.storage.save()
+        self.assertEqual(os.stat(self.shard("State")), state_file)
+        with open(self.shard("City"), "r") as f:
+            records = json.load(f)
+        records["City." + city.id]["name"] = "Reno"
+        with open(self.shard("City") + ".new", "w") as f:
+            json.dump(records, f)
+        os.replace(self.shard("City") + ".new", self.shard("City"))
+        state = self.storage.get(State, self.state.id)
+        read = FileStorage._FileStorage__read
+        with mock.patch.object(FileStorage, "_FileStorage__read",
+                               autospec=True, side_effect=read) as reads:
+            self.storage.reload()
+            self.assertEqual([c[0][1] for c in reads.call_args_list],
+                             [self.shard("City")])
+            self.storage.reload()
+            self.assertEqual(reads.call_count, 1)
+        self.assertIs(self.storage.get(State, self.state.id), state)
+        self.assertEqual(self.storage.get(City, city.id).name, "Reno")
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.count(), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_write_behind(self):
+        """Test that saves are written together by a background thread
+        and that flush waits for them"""
+        writes = []
+        persist = self.storage._FileStorage__persist
+
+        def write():
+            """Count the writes of the file"""
+            writes.append(1)
+            persist()
+        FileStorage._FileStorage__committer = GroupCommit(write, 0.05)
+        cities = [City(name=str(i)) for i in range(10)]
+        for city in cities:
+            self.storage.new(city)
+            self.storage.save()
+        self.storage.flush()
+        self.assertEqual(len(writes), 1)
+        with open(self.path, "r") as f:
+            self.assertEqual(len(json.load(f)), 11)
+        self.assertEqual(self.storage.dirty(), frozenset())
+
+    def merge_saves(self, cities=0):
+        """Save 20 cities from each of 4 forked processes and check that
+        none lost the objects or changes of the others, given how many
+        cities there were before"""
+        def work(name):
+            """Save objects one by one from a worker process"""
+            self.storage.get(State, self.state.id).name = name
+            for i in range(20):
+                self.storage.new(City(name=name + str(i)))
+                self.storage.save()
+            os._exit(0)
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=work, args=(str(i),))
+                   for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(20)
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        self.storage.reload()
+        self.assertEqual(self.storage.count(City), cities + 80)
+        self.assertIn(self.storage.get(State, self.state.id).name,
+                      ["0", "1", "2", "3"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_processes_merge_saves(self):
+        """Test that processes saving the same file keep each other's
+        objects, and their own changes win over what they read"""
+        self.merge_saves()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_processes_merge_saves_sharded(self):
+        """Test that processes forked after reading several shards at once
+        read them again rather than wait on the threads of the parent"""
+        FileStorage._FileStorage__sharded = True
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.new(self.state)
+        self.storage.new(City(name="Oakland", state_id=self.state.id))
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        self.assertIsNotNone(FileStorage._FileStorage__reader)
+        self.merge_saves(1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_children_index(self):
+        """Test that the foreign key indexes follow new, attribute changes,
+        delete and reload"""
+        other = State(name="Nevada")
+        self.storage.new(other)
+        city = City(name="Fresno", state_id=self.state.id)
+        self.storage.new(city)
+        self.assertEqual(self.state.cities, [city])
+        self.assertEqual(other.cities, [])
+        city.state_id = other.id
+        self.assertEqual(self.state.cities, [])
+        self.assertEqual(other.cities, [city])
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        reloaded = self.storage.get(State, other.id)
+        self.assertEqual([c.id for c in reloaded.cities], [city.id])
+        self.storage.delete(reloaded.cities[0])
+        self.assertEqual(reloaded.cities, [])
+        user = User(email="a@b.c", password="pwd")
+        place = Place(name="Loft", city_id=city.id, user_id=user.id)
+        review = Review(text="Nice", place_id=place.id, user_id=user.id)
+        for obj in [user, place, review]:
+            self.storage.new(obj)
+        self.assertEqual(city.places, [place])
+        self.assertEqual(user.places, [place])
+        self.assertEqual(user.reviews, [review])
+        self.assertEqual(place.reviews, [review])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_place_amenity_links(self):
+        """Test that place and amenity links are indexed both ways, saved
+        and dropped with the amenity"""
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        place = Place(name="Loft")
+        for obj in [wifi, pool, place]:
+            self.storage.new(obj)
+        self.storage.link(place, wifi)
+        self.storage.link(place, pool)
+        self.storage.link(place, pool)
+        self.assertEqual(place.amenity_ids, [wifi.id, pool.id])
+        self.assertEqual(place.amenities, [wifi, pool])
+        self.assertEqual(wifi.place_amenities, [place])
+        self.storage.unlink(place, wifi)
+        self.assertEqual(wifi.place_amenities, [])
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        pool = self.storage.get(Amenity, pool.id)
+        self.assertEqual([p.id for p in pool.place_amenities], [place.id])
+        self.storage.delete(pool)
+        self.assertEqual(self.storage.get(Place, place.id).amenity_ids, [])
+        self.assertEqual(pool.place_amenities, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_find_places(self):
+        """Test that the place columns follow writes and reloads"""
+        cheap = Place(city_id="a", price_by_night=50, max_guest=2)
+        dear = Place(city_id="b", price_by_night=300, max_guest=6)
+        self.storage.new(cheap)
+        self.storage.new(dear)
+        find = self.storage.find_places
+        self.assertEqual(find(None, {"price_by_night": (None, 100)}), [cheap])
+        dear.price_by_night = 80
+        self.assertCountEqual(find(None, {"price_by_night": (None, 100)}),
+                              [cheap, dear])
+        self.assertEqual(find({"b"}, {"max_guest": (4, None)}), [dear])
+        self.storage.delete(cheap)
+        self.assertEqual(find(), [dear])
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        self.assertEqual([p.id for p in find({"b"})], [dear.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk_changes(self):
+        """Test that bulk_new, bulk_update and bulk_delete each write the
+        file once"""
+        cities = [City(name=str(i), state_id=self.state.id)
+                  for i in range(50)]
+        persist = mock.patch.object(
+            FileStorage, "_FileStorage__persist", autospec=True,
+            side_effect=FileStorage._FileStorage__persist)
+        with persist as write:
+            self.storage.bulk_new(cities)
+            self.assertEqual(write.call_count, 1)
+            found = self.storage.bulk_update(
+                City, [city.id for city in cities[:10]] + ["missing"],
+                {"name": "Reno", "id": "changed"})
+            self.assertEqual(found, 10)
+            self.assertEqual(write.call_count, 2)
+            self.storage.bulk_delete(cities[40:])
+            self.assertEqual(write.call_count, 3)
+        with open(self.path, "r") as f:
+            records = json.load(f)
+        names = [records[key]["name"] for key in records
+                 if key.startswith("City.")]
+        self.assertEqual(len(names), 40)
+        self.assertEqual(names.count("Reno"), 10)
+        self.assertEqual(cities[0].id, records["City." + cities[0].id]["id"])
+        self.assertEqual(len(self.state.cities), 40)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_cascade_delete(self):
+        """Test that deleting a state deletes its subtree, and only it,
+        in a single write"""
+        user = User()
+        city = City(state_id=self.state.id)
+        place = Place(city_id=city.id, user_id=user.id)
+        review = Review(place_id=place.id, user_id=user.id)
+        other = State()
+        kept = Review(place_id="elsewhere", user_id=user.id)
+        self.storage.bulk_new([user, city, place, review, other, kept])
+        persist = mock.patch.object(
+            FileStorage, "_FileStorage__persist", autospec=True,
+            side_effect=FileStorage._FileStorage__persist)
+        with persist as write:
+            self.storage.cascade_delete(self.state)
+            self.assertEqual(write.call_count, 1)
+        for obj in (self.state, city, place, review):
+            self.assertIsNone(self.storage.get(type(obj), obj.id))
+        for obj in (user, other, kept):
+            self.assertIs(self.storage.get(type(obj), obj.id), obj)
+        with open(self.path, "r") as f:
+            self.assertEqual(len(json.load(f)), 3)
+        self.storage.cascade_delete(user, background=True).result()
+        self.assertIsNone(self.storage.get(Review, kept.id))
+        self.assertEqual(self.storage.count(), 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_layout(self):
+        """Test that objects read in the compact layout keep the same
+        attributes, records and relationships"""
+        city = City(name="Oakland", state_id=self.state.id)
+        city.zip = "94607"
+        self.storage.new(city)
+        self.storage.save()
+        FileStorage._FileStorage__compact = True
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__signature = {}
+        self.storage.reload()
+        state = self.storage.get(State, self.state.id)
+        read = self.storage.get(City, city.id)
+        self.assertIsInstance(read, City)
+        self.assertIsNot(type(read), City)
+        self.assertEqual(read.to_dict(), city.to_dict())
+        self.assertIn("'zip': '94607'", str(read))
+        self.assertEqual(read.created_at, city.created_at)
+        self.assertEqual(state.cities, [read])
+        other = City(name="Fresno", state_id=self.state.id)
+        read.state_id = other.state_id
+        self.assertIs(read.state_id, sys.intern(state.id))
+        read.name = "Alameda"
+        self.storage.save()
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f)["City." + city.id]["name"],
+                             "Alameda")
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Contains the TestGroupCommitDocs and TestGroupCommit classes
+"""
+
+import inspect
+from models.engine import group_commit
+import multiprocessing
+import os
+import pep8
+import threading
+import unittest
+GroupCommit = group_commit.GroupCommit
+
+
+class TestGroupCommitDocs(unittest.TestCase):
+    """Tests to check the documentation and style of GroupCommit class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.gc_f = inspect.getmembers(GroupCommit, inspect.isfunction)
+
+    def test_pep8_conformance_group_commit(self):
+        """Test that models/engine/group_commit.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_group_commit(self):
+        """Test tests/test_models/test_group_commit.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_group_commit_module_docstring(self):
+        """Test for the group_commit.py module docstring"""
+        self.assertIsNot(group_commit.__doc__, None,
+                         "group_commit.py needs a docstring")
+        self.assertTrue(len(group_commit.__doc__) >= 1,
+                        "group_commit.py needs a docstring")
+
+    def test_group_commit_class_docstring(self):
+        """Test for the GroupCommit class docstring"""
+        self.assertIsNot(GroupCommit.__doc__, None,
+                         "GroupCommit class needs a docstring")
+        self.assertTrue(len(GroupCommit.__doc__) >= 1,
+                        "GroupCommit class needs a docstring")
+
+    def test_gc_func_docstrings(self):
+        """Test for the presence of docstrings in GroupCommit methods"""
+        for func in self.gc_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Test the GroupCommit class"""
+    def test_requests_coalesce(self):
+        """Test that requests within the window share one flush"""
+        calls = []
+        committer = GroupCommit(lambda: calls.append(1), 0.05)
+        for i in range(20):
+            committer.request()
+        committer.flush()
+        self.assertEqual(len(calls), 1)
+        committer.request()
+        committer.flush()
+        self.assertEqual(len(calls), 2)
+
+    def test_flush_without_request(self):
+        """Test that flush returns at once when nothing was requested"""
+        committer = GroupCommit(lambda: self.fail("flushed"), 60)
+        committer.flush()
+
+    def test_flush_skips_window(self):
+        """Test that flush does not wait for the window to end"""
+        done = threading.Event()
+        committer = GroupCommit(done.set, 60)
+        committer.request()
+        committer.flush()
+        self.assertTrue(done.is_set())
+
+    def test_flush_raises_error(self):
+        """Test that flush raises what the write failed with"""
+        def fail():
+            """Fail to write"""
+            raise OSError("disk full")
+        committer = GroupCommit(fail, 0.01)
+        committer.request()
+        with self.assertRaises(OSError):
+            committer.flush()
+
+    def test_forked(self):
+        """Test that a process forked after a request writes its own
+        saves rather than wait on the thread of its parent"""
+        calls = []
+        committer = GroupCommit(lambda: calls.append(os.getpid()), 0.01)
+        committer.request()
+        committer.flush()
+
+        def work():
+            """Request a write from the child and check it happened"""
+            committer.request()
+            committer.flush()
+            os._exit(0 if calls[-1] == os.getpid() else 1)
+        child = multiprocessing.get_context("fork").Process(target=work)
+        child.start()
+        child.join(20)
+        if child.is_alive():
+            child.kill()
+            child.join()
+        self.assertEqual(child.exitcode, 0)
+
+    def test_from_env(self):
+        """Test that HBNB_WRITE_BEHIND turns write-behind on"""
+        saved = os.environ.pop("HBNB_WRITE_BEHIND", None)
+        try:
+            self.assertIsNone(GroupCommit.from_env(print))
+            os.environ["HBNB_WRITE_BEHIND"] = "0.2"
+            self.assertIsInstance(GroupCommit.from_env(print), GroupCommit)
+        finally:
+            os.environ.pop("HBNB_WRITE_BEHIND", None)
+            if saved is not None:
+                os.environ["HBNB_WRITE_BEHIND"] = saved
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""
+Contains the TestObjectStorageDocs and TestObjectStorage classes
+"""
+
+import inspect
+from models.city import City
+from models.engine import object_storage
+from models.engine.file_storage import FileStorage
+from models.engine.segment_storage import SegmentStorage
+from models.place import Place
+from models.state import State
+import multiprocessing
+import os
+import pep8
+import threading
+import unittest
+ObjectStorage = object_storage.ObjectStorage
+
+
+class TestObjectStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ObjectStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.object_f = inspect.getmembers(ObjectStorage, inspect.isfunction)
+
+    def test_pep8_conformance_object_storage(self):
+        """Test that models/engine/object_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/object_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_object_storage(self):
+        """Test tests/test_models/test_object_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_object_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_object_storage_module_docstring(self):
+        """Test for the object_storage.py module docstring"""
+        self.assertIsNot(object_storage.__doc__, None,
+                         "object_storage.py needs a docstring")
+        self.assertTrue(len(object_storage.__doc__) >= 1,
+                        "object_storage.py needs a docstring")
+
+    def test_object_storage_class_docstring(self):
+        """Test for the ObjectStorage class docstring"""
+        self.assertIsNot(ObjectStorage.__doc__, None,
+                         "ObjectStorage class needs a docstring")
+        self.assertTrue(len(ObjectStorage.__doc__) >= 1,
+                        "ObjectStorage class needs a docstring")
+
+    def test_object_storage_func_docstrings(self):
+        """Test for the presence of docstrings in ObjectStorage methods"""
+        for func in self.object_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestObjectStorage(unittest.TestCase):
+    """Test the ObjectStorage class"""
+    def test_shared(self):
+        """Test that the file and segment engines share its methods"""
+        for name, func in inspect.getmembers(ObjectStorage,
+                                             inspect.isfunction):
+            self.assertIs(getattr(FileStorage, name), func)
+            self.assertIs(getattr(SegmentStorage, name), func)
+
+    def test_dependents(self):
+        """Test that dependents follows the cascades down, once each"""
+        state = State()
+        cities = [City(state_id=state.id), City(state_id=state.id)]
+        place = Place(city_id=cities[0].id)
+        children = {("City", "state_id", state.id): cities,
+                    ("Place", "city_id", cities[0].id): [place, place]}
+
+        class Storage:
+            """storage whose children are those of the dict above"""
+            def children(self, name, attr, id):
+                """returns the children stored for (name, attr, id)"""
+                return children.get((name, attr, id), [])
+
+        self.assertEqual(object_storage.dependents(Storage(), state),
+                         [state] + cities + [place])
+
+    def test_background_after_fork(self):
+        """Test that a forked process runs the cascading deletes it asks
+        for in the background in a thread of its own"""
+        class Storage(ObjectStorage):
+            """storage recording the objects deleted"""
+            def __init__(self):
+                """starts with nothing deleted"""
+                self._lock = threading.RLock()
+                self.deleted = []
+
+            def children(self, name, attr, id):
+                """returns no children"""
+                return []
+
+            def delete(self, obj):
+                """records obj as deleted"""
+                self.deleted.append(obj)
+
+            def save(self):
+                """does nothing"""
+                pass
+
+        storage = Storage()
+        state = State()
+        storage.cascade_delete(state, background=True).result()
+
+        def work():
+            """Delete in the background from a forked process"""
+            storage.cascade_delete(state, background=True).result(10)
+            os._exit(0 if storage.deleted == [state, state] else 1)
+        worker = multiprocessing.get_context("fork").Process(target=work)
+        worker.start()
+        worker.join(20)
+        if worker.is_alive():
+            worker.kill()
+            worker.join()
+        self.assertEqual(worker.exitcode, 0)
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceColumnsDocs and TestPlaceColumns classes
+"""
+
+import inspect
+from models.engine import place_columns
+from models.place import Place
+import pep8
+import unittest
+PlaceColumns = place_columns.PlaceColumns
+
+
+class TestPlaceColumnsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceColumns class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pc_f = inspect.getmembers(PlaceColumns, inspect.isfunction)
+
+    def test_pep8_conformance_place_columns(self):
+        """Test that models/engine/place_columns.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/place_columns.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_place_columns(self):
+        """Test tests/test_models/test_place_columns.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_place_columns.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_place_columns_module_docstring(self):
+        """Test for the place_columns.py module docstring"""
+        self.assertIsNot(place_columns.__doc__, None,
+                         "place_columns.py needs a docstring")
+        self.assertTrue(len(place_columns.__doc__) >= 1,
+                        "place_columns.py needs a docstring")
+
+    def test_place_columns_class_docstring(self):
+        """Test for the PlaceColumns class docstring"""
+        self.assertIsNot(PlaceColumns.__doc__, None,
+                         "PlaceColumns class needs a docstring")
+        self.assertTrue(len(PlaceColumns.__doc__) >= 1,
+                        "PlaceColumns class needs a docstring")
+
+    def test_pc_func_docstrings(self):
+        """Test for the presence of docstrings in PlaceColumns methods"""
+        for func in self.pc_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestPlaceColumns(unittest.TestCase):
+    """Test the PlaceColumns class, with and without NumPy"""
+    def setUp(self):
+        """Build columns of a few places"""
+        self.places = [Place(city_id="c{}".format(i % 3), price_by_night=i,
+                             max_guest=i % 5) for i in range(40)]
+        self.places[7].price_by_night = "not a number"
+
+    def columns(self):
+        """Return PlaceColumns holding self.places"""
+        columns = PlaceColumns()
+        for place in self.places:
+            columns.put("Place." + place.id, place)
+        return columns
+
+    def expect(self, city_ids=None, ranges=None):
+        """Return the places matched one by one"""
+        return [place for place in self.places
+                if place_columns.matches(place, city_ids, ranges)]
+
+    def check(self):
+        """Check that searches, updates and removals agree with a scan"""
+        columns = self.columns()
+        searches = [(None, None), ({"c1"}, None),
+                    (None, {"price_by_night": (10, 20)}),
+                    ({"c0", "c2", "x"}, {"max_guest": (3, None),
+                                         "price_by_night": (None, 30)})]
+        for city_ids, ranges in searches:
+            self.assertCountEqual(columns.match(city_ids, ranges),
+                                  self.expect(city_ids, ranges))
+        moved = self.places[3]
+        moved.city_id = "c1"
+        moved.price_by_night = 15
+        columns.put("Place." + moved.id, moved)
+        for place in self.places[:10]:
+            columns.remove("Place." + place.id)
+        self.places = self.places[10:]
+        self.assertEqual(len(columns), 30)
+        for city_ids, ranges in searches:
+            self.assertCountEqual(columns.match(city_ids, ranges),
+                                  self.expect(city_ids, ranges))
+
+    @unittest.skipIf(place_columns.numpy is None, "NumPy is not installed")
+    def test_numpy(self):
+        """Test the vectorized columns"""
+        self.check()
+
+    def test_fallback(self):
+        """Test the columns without NumPy"""
+        saved = place_columns.numpy
+        place_columns.numpy = None
+        try:
+            self.check()
+        finally:
+            place_columns.numpy = saved
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueryDocs and TestQuery classes
+"""
+
+import inspect
+import models
+from models.engine import query
+from models.engine.file_storage import FileStorage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+import pep8
+import unittest
+from unittest import mock
+Query = query.Query
+
+
+class TestQueryDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Query class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.query_f = inspect.getmembers(Query, inspect.isfunction)
+
+    def test_pep8_conformance_query(self):
+        """Test that models/engine/query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_query(self):
+        """Test tests/test_models/test_query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_query_module_docstring(self):
+        """Test for the query.py module docstring"""
+        self.assertIsNot(query.__doc__, None,
+                         "query.py needs a docstring")
+        self.assertTrue(len(query.__doc__) >= 1,
+                        "query.py needs a docstring")
+
+    def test_query_class_docstring(self):
+        """Test for the Query class docstring"""
+        self.assertIsNot(Query.__doc__, None,
+                         "Query class needs a docstring")
+        self.assertTrue(len(Query.__doc__) >= 1,
+                        "Query class needs a docstring")
+
+    def test_query_func_docstrings(self):
+        """Test for the presence of docstrings in Query methods"""
+        for func in self.query_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestQuery(unittest.TestCase):
+    """Test queries answered by FileStorage"""
+    def setUp(self):
+        """Store two cities with a few places"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.wifi = Amenity(name="Wifi")
+        self.cities = [City(name="A"), City(name="B")]
+        self.places = [Place(city_id=self.cities[i % 2].id, name=str(i),
+                             price_by_night=10 * i, number_rooms=i % 3)
+                       for i in range(10)]
+        self.places[3].amenity_ids = [self.wifi.id]
+        for obj in [self.wifi] + self.cities + self.places:
+            self.storage.new(obj)
+
+    def tearDown(self):
+        """Restore the stored objects"""
+        FileStorage._FileStorage__objects = self.saved
+
+    def names(self, places):
+        """Return the names of places"""
+        return [place.name for place in places]
+
+    def test_filter(self):
+        """Test the comparisons filter accepts"""
+        places = self.storage.query(Place)
+        self.assertEqual(len(list(places)), 10)
+        self.assertEqual(self.names(places.filter(name="4")), ["4"])
+        self.assertCountEqual(
+            self.names(places.filter(price_by_night__gt=60,
+                                     number_rooms__ne=0)), ["7", "8"])
+        self.assertCountEqual(self.names(places.filter(name__in=["1", "2"])),
+                              ["1", "2"])
+        self.assertEqual(self.names(places.filter(
+            amenity_ids__contains=self.wifi.id)), ["3"])
+        self.assertEqual(list(places.filter(missing__lt=3)), [])
+        with self.assertRaises(ValueError):
+            places.filter(name__like="1")
+
+    def test_order_and_limit(self):
+        """Test that objects are ordered and limited, and that refining a
+        query leaves the one it came from unchanged"""
+        places = self.storage.query(Place).order_by("number_rooms",
+                                                    "-price_by_night")
+        self.assertEqual(self.names(places.limit(4)), ["9", "6", "3", "0"])
+        self.assertEqual(len(list(places)), 10)
+        self.assertEqual(places.first().name, "9")
+        self.assertIsNone(places.filter(name="none").first())
+
+    def test_indexes(self):
+        """Test that conditions on ids, foreign keys and place numbers are
+        answered without going through all the objects"""
+        city = self.cities[0]
+        with mock.patch.object(self.storage, "all",
+                               side_effect=AssertionError):
+            places = self.storage.query(Place)
+            self.assertCountEqual(self.names(places.filter(city_id=city.id)),
+                                  ["0", "2", "4", "6", "8"])
+            self.assertEqual(self.names(places.filter(
+                city_id=city.id, price_by_night__lte=25)), ["0", "2"])
+            self.assertEqual(self.names(places.filter(
+                price_by_night__gte=85)), ["9"])
+            self.assertEqual(self.names(places.filter(
+                id__in=[self.places[5].id, "missing"])), ["5"])
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Contains the TestReplicasDocs, TestReplicas and TestRoutingSession classes
+"""
+
+import inspect
+from models.engine import replicas
+import pep8
+from sqlalchemy import Column, MetaData, String, Table, create_engine, text
+import unittest
+Replicas = replicas.Replicas
+RoutingSession = replicas.RoutingSession
+
+
+class TestReplicasDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the replicas module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.replicas_f = inspect.getmembers(Replicas, inspect.isfunction)
+        cls.session_f = [func for func in inspect.getmembers(
+            RoutingSession, inspect.isfunction)
+            if func[0] in vars(RoutingSession)]
+
+    def test_pep8_conformance_replicas(self):
+        """Test that models/engine/replicas.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/replicas.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_replicas(self):
+        """Test tests/test_models/test_replicas.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_replicas.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_replicas_module_docstring(self):
+        """Test for the replicas.py module docstring"""
+        self.assertIsNot(replicas.__doc__, None,
+                         "replicas.py needs a docstring")
+        self.assertTrue(len(replicas.__doc__) >= 1,
+                        "replicas.py needs a docstring")
+
+    def test_replicas_class_docstrings(self):
+        """Test for the Replicas and RoutingSession class docstrings"""
+        for cls in (Replicas, RoutingSession):
+            self.assertIsNot(cls.__doc__, None,
+                             "{} class needs a docstring".format(cls))
+            self.assertTrue(len(cls.__doc__) >= 1,
+                            "{} class needs a docstring".format(cls))
+
+    def test_replicas_func_docstrings(self):
+        """Test for the presence of docstrings in the methods"""
+        for func in self.replicas_f + self.session_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestReplicas(unittest.TestCase):
+    """Test the Replicas class"""
+    def setUp(self):
+        """Make two reachable engines and one that is not"""
+        self.up = [create_engine("sqlite://"), create_engine("sqlite://")]
+        self.down = create_engine("sqlite:////nonexistent/dir/replica.db")
+
+    def test_pick_in_turn(self):
+        """Test that the replicas are picked in turn"""
+        pool = Replicas(self.up)
+        self.assertEqual([pool.pick() for i in range(4)], self.up * 2)
+
+    def test_unreachable_skipped(self):
+        """Test that a replica that cannot be reached is not picked, and
+        that none is picked when they are all down"""
+        pool = Replicas([self.down, self.up[0]])
+        self.assertFalse(pool.healthy(self.down))
+        self.assertEqual([pool.pick() for i in range(3)], [self.up[0]] * 3)
+        self.assertIsNone(Replicas([self.down]).pick())
+
+    def test_mark_down(self):
+        """Test that a replica marked down is left out for the interval"""
+        pool = Replicas(self.up, interval=60)
+        pool.mark_down(self.up[0])
+        self.assertEqual([pool.pick() for i in range(2)], [self.up[1]] * 2)
+        pool = Replicas(self.up, interval=0)
+        pool.mark_down(self.up[0])
+        self.assertTrue(pool.healthy(self.up[0]))
+
+    def test_failed_statement(self):
+        """Test that a replica is marked down when it cannot be connected
+        to, but not when a statement is wrong"""
+        pool = Replicas(self.up + [self.down], interval=60)
+        with self.up[0].connect() as connection:
+            with self.assertRaises(Exception):
+                connection.execute(text("SELECT * FROM missing"))
+        with self.assertRaises(Exception):
+            self.down.connect()
+        self.assertEqual(list(pool._Replicas__down), [self.down])
+
+
+class TestRoutingSession(unittest.TestCase):
+    """Test the RoutingSession class"""
+    def test_get_bind(self):
+        """Test that reads go to the route and writes to the bind"""
+        primary = create_engine("sqlite://")
+        replica = create_engine("sqlite://")
+        table = Table("things", MetaData(), Column("id", String(60)))
+        session = RoutingSession(bind=primary, route=lambda s: replica)
+        self.assertIs(session.get_bind(clause=text("SELECT 1")), replica)
+        self.assertIs(session.get_bind(clause=table.select()), replica)
+        self.assertIs(session.get_bind(clause=table.insert()), primary)
+        self.assertIs(session.get_bind(clause=table.delete()), primary)
+        session = RoutingSession(bind=primary, route=lambda s: None)
+        self.assertIs(session.get_bind(clause=table.select()), primary)
+        self.assertIs(RoutingSession(bind=primary).get_bind(), primary)
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Contains the TestRowCacheDocs and TestRowCache classes
+"""
+
+import inspect
+from models.engine import row_cache
+import pep8
+import unittest
+from unittest import mock
+RowCache = row_cache.RowCache
+
+
+class TestRowCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of RowCache class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(RowCache, inspect.isfunction)
+
+    def test_pep8_conformance_row_cache(self):
+        """Test that models/engine/row_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/row_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_row_cache(self):
+        """Test tests/test_models/test_row_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_row_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_row_cache_module_docstring(self):
+        """Test for the row_cache.py module docstring"""
+        self.assertIsNot(row_cache.__doc__, None,
+                         "row_cache.py needs a docstring")
+        self.assertTrue(len(row_cache.__doc__) >= 1,
+                        "row_cache.py needs a docstring")
+
+    def test_row_cache_class_docstring(self):
+        """Test for the RowCache class docstring"""
+        self.assertIsNot(RowCache.__doc__, None,
+                         "RowCache class needs a docstring")
+        self.assertTrue(len(RowCache.__doc__) >= 1,
+                        "RowCache class needs a docstring")
+
+    def test_row_cache_func_docstrings(self):
+        """Test for the presence of docstrings in RowCache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestRowCache(unittest.TestCase):
+    """Test the RowCache class"""
+    def test_least_recently_used_evicted(self):
+        """Test that the cache keeps its most recently used rows"""
+        cache = RowCache(2)
+        cache.put("a", 1, cache.generation)
+        cache.put("b", 2, cache.generation)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3, cache.generation)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")),
+                         (1, None, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_evict(self):
+        """Test that evicted rows are gone and that a row read before an
+        eviction is not kept"""
+        cache = RowCache(10)
+        cache.put("a", 1, cache.generation)
+        cache.put("b", 2, cache.generation)
+        generation = cache.generation
+        cache.evict(["a"])
+        self.assertEqual((cache.get("a"), cache.get("b")), (None, 2))
+        cache.put("a", 1, generation)
+        self.assertIsNone(cache.get("a"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled(self):
+        """Test that a cache of size 0 keeps nothing"""
+        cache = RowCache(0)
+        cache.put("a", 1, cache.generation)
+        self.assertIsNone(cache.get("a"))
+
+    def test_max_age(self):
+        """Test that a row is kept max_age seconds at most"""
+        cache = RowCache(10, 5)
+        with mock.patch.object(row_cache.time, "monotonic",
+                               return_value=100.0) as monotonic:
+            cache.put("a", 1, cache.generation)
+            monotonic.return_value = 104.0
+            self.assertEqual(cache.get("a"), 1)
+            monotonic.return_value = 105.0
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,247 @@
+#!/usr/bin/python3
+"""
+Contains the TestSegmentStorageDocs and TestSegmentStorage classes
+"""
+
+import glob
+import inspect
+import models
+import multiprocessing
+from models.engine import segment_storage
+from models.city import City
+from models.review import Review
+from models.state import State
+import os
+import pep8
+import unittest
+from unittest import mock
+SegmentStorage = segment_storage.SegmentStorage
+
+
+class TestSegmentStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SegmentStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.seg_f = inspect.getmembers(SegmentStorage, inspect.isfunction)
+
+    def test_pep8_conformance_segment_storage(self):
+        """Test that models/engine/segment_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/segment_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_segment_storage(self):
+        """Test tests/test_models/test_segment_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_segment_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_segment_storage_module_docstring(self):
+        """Test for the segment_storage.py module docstring"""
+        self.assertIsNot(segment_storage.__doc__, None,
+                         "segment_storage.py needs a docstring")
+        self.assertTrue(len(segment_storage.__doc__) >= 1,
+                        "segment_storage.py needs a docstring")
+
+    def test_segment_storage_class_docstring(self):
+        """Test for the SegmentStorage class docstring"""
+        self.assertIsNot(SegmentStorage.__doc__, None,
+                         "SegmentStorage class needs a docstring")
+        self.assertTrue(len(SegmentStorage.__doc__) >= 1,
+                        "SegmentStorage class needs a docstring")
+
+    def test_seg_func_docstrings(self):
+        """Test for the presence of docstrings in SegmentStorage methods"""
+        for func in self.seg_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestSegmentStorage(unittest.TestCase):
+    """Test the SegmentStorage class"""
+    def setUp(self):
+        """Point the storage to scratch files and install it as storage"""
+        self.path = "test_file.seg"
+        self.saved = SegmentStorage._SegmentStorage__file_path
+        SegmentStorage._SegmentStorage__file_path = self.path
+        self.storage = self.restart()
+
+    def tearDown(self):
+        """Restore the storage and remove the scratch files"""
+        self.patch.stop()
+        SegmentStorage._SegmentStorage__file_path = self.saved
+        for path in glob.glob(self.path + "*"):
+            os.remove(path)
+
+    def restart(self, cache_size="10000"):
+        """Return a storage opened from disk as a new process would"""
+        if hasattr(self, "patch"):
+            self.patch.stop()
+        with mock.patch.dict(os.environ, {"HBNB_SEGMENT_CACHE": cache_size}):
+            storage = SegmentStorage()
+        self.patch = mock.patch("models.storage", storage)
+        self.patch.start()
+        storage.reload()
+        return storage
+
+    def test_save_and_reload(self):
+        """Test that saved objects are read back by a new storage"""
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        storage = self.restart()
+        self.assertEqual(storage.count(), 2)
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.get(City, city.id).name, "Fresno")
+        self.assertEqual(storage.get("State", state.id).to_dict(),
+                         state.to_dict())
+        self.assertEqual(list(storage.all(City)), ["City." + city.id])
+        self.assertEqual(len(storage.all()), 2)
+
+    def test_attribute_change_saved(self):
+        """Test that a change to a loaded object is written on save"""
+        state = State(name="Nevada")
+        self.storage.new(state)
+        self.storage.save()
+        storage = self.restart()
+        loaded = storage.get(State, state.id)
+        loaded.name = "Arizona"
+        self.assertIn("State." + state.id, storage.dirty())
+        storage.save()
+        storage = self.restart()
+        self.assertEqual(storage.get(State, state.id).name, "Arizona")
+
+    def test_delete(self):
+        """Test that deleted objects are gone after save and restart"""
+        state = State(name="Utah")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.delete(state)
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertEqual(self.storage.count(State), 0)
+        self.storage.save()
+        storage = self.restart()
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertNotIn("State." + state.id, storage.all())
+        self.assertEqual(storage.count(), 0)
+
+    def test_bounded_cache(self):
+        """Test that no more than HBNB_SEGMENT_CACHE objects stay loaded"""
+        reviews = [Review(text=str(i)) for i in range(50)]
+        for review in reviews:
+            self.storage.new(review)
+        self.storage.save()
+        storage = self.restart(cache_size="5")
+        texts = [review.text for review in storage.all(Review).values()]
+        self.assertCountEqual(texts, [str(i) for i in range(50)])
+        self.assertLessEqual(len(storage._SegmentStorage__cache), 5)
+        self.assertEqual(storage.get(Review, reviews[0].id).text, "0")
+
+    def test_index_merge_and_compaction(self):
+        """Test that merging the index and compacting keep every object"""
+        with mock.patch.object(SegmentStorage,
+                               "_SegmentStorage__merge_after", 3):
+            states = [State(name=str(i)) for i in range(10)]
+            for state in states:
+                self.storage.new(state)
+                self.storage.save()
+            for state in states[:5]:
+                self.storage.delete(state)
+            self.storage.save()
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+        size = os.path.getsize(self.path + ".0")
+        self.storage.compact()
+        self.assertFalse(os.path.exists(self.path + ".0"))
+        self.assertLess(os.path.getsize(self.path + ".1"), size)
+        storage = self.restart()
+        self.assertCountEqual([s.name for s in storage.all(State).values()],
+                              [str(i) for i in range(5, 10)])
+        self.assertEqual(storage.count(State), 5)
+
+    def test_processes_share_segment(self):
+        """Test that processes appending to, merging and compacting the
+        same files find each other's objects where the index says"""
+        def work(name):
+            """Save states one by one from a worker process, compacting
+            halfway through in the first one"""
+            for i in range(100):
+                self.storage.new(State(name=name + "." + str(i)))
+                self.storage.save()
+                if name == "0" and i == 50:
+                    self.storage.compact()
+            os._exit(0)
+        context = multiprocessing.get_context("fork")
+        with mock.patch.object(SegmentStorage,
+                               "_SegmentStorage__merge_after", 20):
+            workers = [context.Process(target=work, args=(str(i),))
+                       for i in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(20)
+                if worker.is_alive():
+                    worker.kill()
+                    worker.join()
+                self.assertEqual(worker.exitcode, 0)
+        storage = self.restart(cache_size="0")
+        self.assertCountEqual([s.name for s in storage.all(State).values()],
+                              [str(i) + "." + str(j)
+                               for i in range(4) for j in range(100)])
+        self.assertEqual(storage.count(State), 400)
+
+    def test_bulk_changes(self):
+        """Test that bulk changes are all written by a single append"""
+        states = [State(name=str(i)) for i in range(20)]
+        self.storage.bulk_new(states)
+        self.assertEqual(self.storage.dirty(), frozenset())
+        found = self.storage.bulk_update(
+            "State", [state.id for state in states[:5]], {"name": "Iowa"})
+        self.assertEqual(found, 5)
+        self.storage.bulk_delete(states[15:])
+        self.assertEqual(self.storage.dirty(), frozenset())
+        storage = self.restart()
+        self.assertEqual(storage.count(State), 15)
+        self.assertEqual([s.name for s in storage.all(State).values()
+                          ].count("Iowa"), 5)
+
+    def test_cascade_delete(self):
+        """Test that deleting a state deletes its cities and reviews of
+        their places, but not the other objects"""
+        state = State()
+        city = City(state_id=state.id)
+        review = Review(place_id="place", user_id="user")
+        other = City(state_id="elsewhere")
+        self.storage.bulk_new([state, city, review, other])
+        self.storage.cascade_delete(state, background=True).result()
+        storage = self.restart()
+        self.assertIsNone(storage.get(City, city.id))
+        self.assertEqual(storage.count(), 2)
+
+    def test_query(self):
+        """Test that queries read the objects back from the segment"""
+        states = [State(name=name) for name in ("Utah", "Iowa", "Ohio")]
+        self.storage.bulk_new(states)
+        storage = self.restart()
+        query = storage.query(State).filter(name__ne="Iowa")
+        self.assertEqual([s.name for s in query.order_by("name")],
+                         ["Ohio", "Utah"])
+        self.assertEqual(storage.query("State").filter(
+            id=states[1].id).first().name, "Iowa")
+
+    def test_iter(self):
+        """Test that iter reads the objects of a class back one by one"""
+        states = [State(name=name) for name in ("Utah", "Iowa", "Ohio")]
+        self.storage.bulk_new(states)
+        storage = self.restart()
+        self.assertCountEqual([s.name for s in storage.iter(State)],
+                              ["Utah", "Iowa", "Ohio"])
+        self.assertEqual(len(list(storage.iter())), 3)
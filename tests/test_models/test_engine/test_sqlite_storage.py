@@ -0,0 +1,309 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import glob
+import inspect
+import models
+from models.base_model import Base, BaseModel
+from models.engine import sqlite_storage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import os
+import pep8
+from sqlalchemy import event
+import unittest
+from unittest import mock
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sql_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_sqlite_storage(self):
+        """Test tests/test_models/test_sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1,
+                        "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1,
+                        "SQLiteStorage class needs a docstring")
+
+    def test_sql_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sql_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_engine != 'sqlite',
+                 "not testing sqlite storage")
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class"""
+    def execute(self, sql):
+        """Return the rows of sql run on the storage's database"""
+        engine = models.storage._DBStorage__engine
+        with engine.connect() as connection:
+            return connection.exec_driver_sql(sql).fetchall()
+
+    def indexed_columns(self, table):
+        """Return the first column of every index of table"""
+        return [self.execute("PRAGMA index_info({})".format(index[1]))[0][2]
+                for index in self.execute("PRAGMA index_list({})".format(
+                    table))]
+
+    def test_pragmas(self):
+        """Test that connections use WAL mode and enforce foreign keys"""
+        self.assertEqual(self.execute("PRAGMA journal_mode"), [("wal",)])
+        self.assertEqual(self.execute("PRAGMA foreign_keys"), [(1,)])
+
+    def test_foreign_key_indexes(self):
+        """Test that the foreign key columns are indexed"""
+        for table, column in [("cities", "state_id"), ("places", "city_id"),
+                              ("places", "user_id"), ("reviews", "place_id"),
+                              ("reviews", "user_id"),
+                              ("place_amenity", "amenity_id")]:
+            self.assertIn(column, self.indexed_columns(table), table)
+
+    def test_foreign_key_enforced(self):
+        """Test that rows pointing to missing rows are rejected"""
+        state = State(name="Ohio")
+        state_id = state.id
+        models.storage.new(state)
+        models.storage.save()
+        models.storage.new(City(name="Nowhere", state_id="missing"))
+        with self.assertRaises(Exception):
+            models.storage.save()
+        models.storage.close()
+        self.assertIsNotNone(models.storage.get(State, state_id))
+
+    def test_bulk_changes(self):
+        """Test that rows are inserted, updated and deleted in bulk"""
+        states = [State(name=str(i)) for i in range(1200)]
+        ids = [state.id for state in states]
+        count = models.storage.count(State)
+        models.storage.bulk_new(states)
+        self.assertEqual(models.storage.count(State), count + 1200)
+        found = models.storage.bulk_update(State, ids[:700] + ["missing"],
+                                           {"name": "Iowa", "id": "x"})
+        self.assertEqual(found, 700)
+        self.assertEqual(models.storage.get(State, ids[0]).name, "Iowa")
+        models.storage.bulk_delete(states)
+        self.assertEqual(models.storage.count(State), count)
+        self.assertIsNone(models.storage.get(State, ids[0]))
+
+    def test_cascade_delete(self):
+        """Test that deleting a state deletes its subtree through the
+        ON DELETE CASCADE rules"""
+        state, user = State(name="Ohio"), User(email="a", password="b")
+        city = City(name="Akron", state_id=state.id)
+        place = Place(name="Loft", city_id=city.id, user_id=user.id)
+        review = Review(text="Nice", place_id=place.id, user_id=user.id)
+        ids = [(type(obj), obj.id) for obj in (city, place, review)]
+        models.storage.bulk_new([state, user, city, place, review])
+        models.storage.close()
+        state = models.storage.get(State, state.id)
+        models.storage.cascade_delete(state, background=True).result()
+        models.storage.close()
+        for cls, id in ids:
+            self.assertIsNone(models.storage.get(cls, id))
+        self.assertIsNotNone(models.storage.get(User, user.id))
+
+    def test_query(self):
+        """Test that queries are filtered, ordered and limited in SQL"""
+        state = State(name="Ohio")
+        cities = [City(name=name, state_id=state.id)
+                  for name in ("Akron", "Dayton", "Canton")]
+        models.storage.bulk_new([state] + cities)
+        query = models.storage.query(City).filter(state_id=state.id)
+        self.assertEqual([city.name for city in query.order_by("name")],
+                         ["Akron", "Canton", "Dayton"])
+        self.assertEqual(query.order_by("-name").first().name, "Dayton")
+        self.assertEqual([city.name for city in query.filter(
+            name__in=["Akron", "Nowhere"])], ["Akron"])
+        with self.assertRaises(ValueError):
+            list(query.filter(places__eq=None))
+
+    def selects(self, function, *args):
+        """Return the result of function(*args) in a new session and the
+        number of SELECT statements it ran"""
+        statements = []
+
+        def executed(conn, cursor, statement, parameters, context, many):
+            """Record a statement run by the engine"""
+            statements.append(statement)
+        engine = models.storage._DBStorage__engine
+        models.storage.close()
+        event.listen(engine, "before_cursor_execute", executed)
+        try:
+            result = function(*args)
+        finally:
+            event.remove(engine, "before_cursor_execute", executed)
+        return result, len([statement for statement in statements
+                            if statement.startswith("SELECT")])
+
+    def test_get_cache(self):
+        """Test that get reads a row by primary key once, until a commit
+        changes it"""
+        states = [State(name=name) for name in ("Utah", "Iowa", "Ohio")]
+        models.storage.bulk_new(states)
+        state = states[0]
+        self.assertEqual(self.selects(models.storage.get, State, state.id)[1],
+                         1)
+        obj, selects = self.selects(models.storage.get, "State", state.id)
+        self.assertEqual((obj.name, selects), ("Utah", 0))
+        obj.name = "Texas"
+        models.storage.save()
+        obj, selects = self.selects(models.storage.get, State, state.id)
+        self.assertEqual((obj.name, selects), ("Texas", 1))
+        self.assertIsNone(self.selects(models.storage.get, State, "none")[0])
+        found, selects = self.selects(models.storage.get_many, State,
+                                      [s.id for s in states] + ["none"])
+        self.assertEqual(sorted(found), sorted(s.id for s in states))
+        self.assertEqual(selects, 1)
+        pending = State(name="Iowa")
+        models.storage.new(pending)
+        self.assertIs(models.storage.get(State, pending.id), pending)
+        models.storage.close()
+        self.assertIsNone(models.storage.get(State, pending.id))
+
+    def test_get_deleted(self):
+        """Test that an object deleted in the session is not found, before
+        and after the deletion is flushed"""
+        states = [State(name=name) for name in ("Utah", "Iowa")]
+        models.storage.bulk_new(states)
+        ids = [state.id for state in states]
+        models.storage.close()
+        self.assertEqual(len(models.storage.get_many(State, ids)), 2)
+        models.storage.delete(models.storage.get(State, ids[0]))
+        self.assertIsNone(models.storage.get(State, ids[0]))
+        self.assertEqual(list(models.storage.get_many(State, ids)), ids[1:])
+        models.storage._DBStorage__session.flush()
+        self.assertIsNone(models.storage.get(State, ids[0]))
+        self.assertEqual(list(models.storage.get_many(State, ids)), ids[1:])
+        models.storage.close()
+        self.assertIsNotNone(models.storage.get(State, ids[0]))
+
+    def test_get_unmapped(self):
+        """Test that get finds nothing for a class with no table"""
+        self.assertIsNone(models.storage.get("BaseModel", "none"))
+        self.assertIsNone(models.storage.get(BaseModel, "none"))
+        self.assertIsNone(models.storage.get("Foo", "none"))
+        self.assertEqual(models.storage.get_many(BaseModel, ["none"]), {})
+
+    def test_count_unmapped(self):
+        """Test that a class with no table counts 0"""
+        self.assertEqual(models.storage.count(BaseModel), 0)
+        self.assertEqual(models.storage.count("Foo"), 0)
+
+    def test_counts(self):
+        """Test that counts are run by the database, all the classes in
+        one query, and reused for max_age seconds"""
+        start = models.storage.counts()
+        models.storage.bulk_new([State(name="Utah"), State(name="Iowa")])
+        count, selects = self.selects(models.storage.count, State)
+        self.assertEqual((count, selects), (start["State"] + 2, 1))
+        counts, selects = self.selects(models.storage.counts)
+        self.assertEqual(selects, 1)
+        self.assertEqual(counts, dict(start, State=start["State"] + 2))
+        self.assertEqual(models.storage.count(), sum(counts.values()))
+        self.assertEqual(models.storage.counts(60), counts)
+        models.storage.new(State(name="Ohio"))
+        models.storage.save()
+        self.assertEqual(self.selects(models.storage.counts, 60),
+                         (counts, 0))
+        self.assertEqual(models.storage.counts()["State"],
+                         start["State"] + 3)
+        models.storage._DBStorage__counted = (float("-inf"), {})
+        estimates = dict(counts, State=10 ** 7)
+        with mock.patch.object(models.storage, "_estimates",
+                               return_value=estimates):
+            self.assertEqual(models.storage.counts(60)["State"], 10 ** 7)
+
+    def test_iter(self):
+        """Test that iter streams the rows of a class, or of all of them"""
+        start = models.storage.counts()
+        states = [State(name=str(i)) for i in range(5)]
+        models.storage.bulk_new(states)
+        ids = [state.id for state in models.storage.iter(State, 2)]
+        self.assertEqual(len(ids), start["State"] + 5)
+        self.assertTrue(set(ids) >= {state.id for state in states})
+        self.assertEqual(len(list(models.storage.iter())),
+                         sum(start.values()) + 5)
+
+    def test_replicas(self):
+        """Test that reads allowed on replicas go to one unless a commit
+        was just made, that writes go to the primary and that reads fall
+        back to the primary when the replica is down"""
+        env = {"HBNB_SQLITE_PATH": "test_primary.db",
+               "HBNB_DB_REPLICAS": "sqlite:///test_replica.db",
+               "HBNB_DB_CACHE": "0", "HBNB_DB_STICKY": "60"}
+        with mock.patch.dict(os.environ, env):
+            storage = SQLiteStorage()
+        try:
+            storage.reload()
+            replica = storage._DBStorage__replicas.engines[0]
+            Base.metadata.create_all(replica)
+            state = State(name="primary")
+            storage.new(state)
+            storage.save()
+            with replica.begin() as connection:
+                connection.execute(State.__table__.insert().values(
+                    id=state.id, name="replica", created_at=state.created_at,
+                    updated_at=state.updated_at))
+            storage.read_from_replicas()
+            self.assertEqual(storage.get(State, state.id).name, "primary")
+            storage.close()
+            storage._DBStorage__written = float("-inf")
+            obj = storage.get(State, state.id)
+            self.assertEqual(obj.name, "replica")
+            obj.name = "changed"
+            storage.save()
+            self.assertEqual(storage.get(State, state.id).name, "changed")
+            storage.close()
+            storage._DBStorage__written = float("-inf")
+            storage.read_from_replicas(False)
+            self.assertEqual(storage.get(State, state.id).name, "changed")
+            storage.close()
+            storage.read_from_replicas()
+            self.assertEqual(storage.get(State, state.id).name, "replica")
+            storage.close()
+            storage._DBStorage__replicas.mark_down(replica)
+            self.assertEqual(storage.get(State, state.id).name, "changed")
+        finally:
+            storage.close()
+            storage._DBStorage__engine.dispose()
+            replica.dispose()
+            for path in glob.glob("test_primary.db*") + \
+                    glob.glob("test_replica.db*"):
+                os.remove(path)
@@ -0,0 +1,221 @@
+#!/usr/bin/python3
+"""
+Contains the TestWALStorageDocs and TestWALStorage classes
+"""
+
+import inspect
+import json
+import models
+from models.engine import wal_storage
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.state import State
+import multiprocessing
+import os
+import pep8
+import unittest
+WALStorage = wal_storage.WALStorage
+
+
+class TestWALStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of WALStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.wal_f = inspect.getmembers(WALStorage, inspect.isfunction)
+
+    def test_pep8_conformance_wal_storage(self):
+        """Test that models/engine/wal_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/wal_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_wal_storage(self):
+        """Test tests/test_models/test_wal_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_wal_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_wal_storage_module_docstring(self):
+        """Test for the wal_storage.py module docstring"""
+        self.assertIsNot(wal_storage.__doc__, None,
+                         "wal_storage.py needs a docstring")
+        self.assertTrue(len(wal_storage.__doc__) >= 1,
+                        "wal_storage.py needs a docstring")
+
+    def test_wal_storage_class_docstring(self):
+        """Test for the WALStorage class docstring"""
+        self.assertIsNot(WALStorage.__doc__, None,
+                         "WALStorage class needs a docstring")
+        self.assertTrue(len(WALStorage.__doc__) >= 1,
+                        "WALStorage class needs a docstring")
+
+    def test_wal_func_docstrings(self):
+        """Test for the presence of docstrings in WALStorage methods"""
+        for func in self.wal_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestWALStorage(unittest.TestCase):
+    """Test the WALStorage class"""
+    def setUp(self):
+        """Point the storage to scratch files and an empty object store"""
+        self.path = "test_wal_file.json"
+        self.log = self.path + ".log"
+        self.saved = (WALStorage._WALStorage__file_path,
+                      WALStorage._WALStorage__log_path,
+                      FileStorage._FileStorage__objects)
+        WALStorage._WALStorage__file_path = self.path
+        WALStorage._WALStorage__log_path = self.log
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        """Restore the storage and remove the scratch files"""
+        (WALStorage._WALStorage__file_path,
+         WALStorage._WALStorage__log_path,
+         FileStorage._FileStorage__objects) = self.saved
+        for path in [self.path, self.log, self.log + ".old",
+                     self.log + ".lock"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def log_entries(self):
+        """Return the records of the log"""
+        with open(self.log, "r") as f:
+            return [json.loads(line) for line in f]
+
+    def restart(self):
+        """Return a storage reloaded from disk as a new process would"""
+        FileStorage._FileStorage__objects = {}
+        storage = WALStorage()
+        storage.reload()
+        return storage
+
+    def test_save_appends_changes_only(self):
+        """Test that save appends one record per changed object"""
+        storage = WALStorage()
+        storage.reload()
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        self.assertEqual(len(self.log_entries()), 2)
+        city.name = "San Jose"
+        storage.save()
+        storage.save()
+        entries = self.log_entries()
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[-1]["key"], "City." + city.id)
+        self.assertEqual(entries[-1]["value"]["name"], "San Jose")
+        storage.delete(state)
+        storage.save()
+        self.assertEqual(self.log_entries()[-1],
+                         {"op": "delete", "key": "State." + state.id})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_reload_replays_log(self):
+        """Test that a new storage sees the snapshot plus the log tail"""
+        storage = WALStorage()
+        storage.reload()
+        state = State(name="Nevada")
+        gone = State(name="Gone")
+        storage.new(state)
+        storage.new(gone)
+        storage.save()
+        storage.compact(wait=True)
+        state.name = "Arizona"
+        storage.delete(gone)
+        storage.save()
+        storage = self.restart()
+        self.assertEqual(storage.get(State, state.id).name, "Arizona")
+        self.assertIsNone(storage.get(State, gone.id))
+        self.assertEqual(storage.count(State), 1)
+
+    def test_compaction(self):
+        """Test that compacting folds the log into the snapshot"""
+        storage = WALStorage()
+        storage.reload()
+        states = [State(name=str(i)) for i in range(5)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        storage.compact(wait=True)
+        self.assertFalse(os.path.exists(self.log + ".old"))
+        self.assertEqual(os.path.getsize(self.log), 0)
+        with open(self.path, "r") as f:
+            snapshot = json.load(f)
+        self.assertCountEqual(snapshot.keys(),
+                              ["State." + s.id for s in states])
+        storage = self.restart()
+        self.assertEqual(storage.count(State), 5)
+
+    def test_torn_record_ignored(self):
+        """Test that a partial record at the end of the log is skipped"""
+        storage = WALStorage()
+        storage.reload()
+        state = State(name="Oregon")
+        storage.new(state)
+        storage.save()
+        with open(self.log, "a") as f:
+            f.write('{"op": "delete", "key": "State.')
+        storage = self.restart()
+        self.assertIsNotNone(storage.get(State, state.id))
+
+    def test_leftover_old_log_recovered(self):
+        """Test that a log set aside by an interrupted compaction is
+        replayed and folded into the snapshot"""
+        storage = WALStorage()
+        storage.reload()
+        state = State(name="Utah")
+        storage.new(state)
+        storage.save()
+        storage._WALStorage__log.close()
+        os.replace(self.log, self.log + ".old")
+        storage = self.restart()
+        self.assertIsNotNone(storage.get(State, state.id))
+        self.assertFalse(os.path.exists(self.log + ".old"))
+        with open(self.path, "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+
+    def test_processes_share_log(self):
+        """Test that a compaction keeps the records other processes
+        appended, and that a process whose log was rotated meanwhile
+        appends to the new one"""
+        storage = WALStorage()
+        storage.reload()
+        storage.new(State(name="Parent"))
+        storage.save()
+        context = multiprocessing.get_context("fork")
+        compacted = context.Event()
+
+        def work(name, wait):
+            """Save a state from a worker process"""
+            if wait and not compacted.wait(20):
+                os._exit(1)
+            storage.new(State(name=name))
+            storage.save()
+            os._exit(0)
+        late = context.Process(target=work, args=("Late", True))
+        late.start()
+        early = context.Process(target=work, args=("Early", False))
+        early.start()
+        early.join(20)
+        storage.compact(wait=True)
+        compacted.set()
+        late.join(20)
+        self.assertEqual((early.exitcode, late.exitcode), (0, 0))
+        storage.reload()
+        names = ["Early", "Late", "Parent"]
+        self.assertEqual(sorted(s.name for s in storage.all(State).values()),
+                         names)
+        storage = self.restart()
+        self.assertEqual(sorted(s.name for s in storage.all(State).values()),
+                         names)
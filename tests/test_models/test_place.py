@@ -171,6 +171,15 @@ class TestPlace(unittest.TestCase):
         self.assertEqual(type(place.amenity_ids), list)
         self.assertEqual(len(place.amenity_ids), 0)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenity_ids_per_instance(self):
+        """Test that places do not share their amenity_ids list"""
+        place = Place()
+        other = Place()
+        place.amenity_ids.append("1234")
+        self.assertEqual(other.amenity_ids, [])
+        self.assertEqual(Place.amenity_ids, [])
+
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""
         p = Place()
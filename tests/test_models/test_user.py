@@ -85,6 +85,12 @@ class TestUser(unittest.TestCase):
         else:
             self.assertEqual(user.password, "")
 
+    def test_from_storage_password(self):
+        """Test that a password read from storage is not hashed again"""
+        user = User(password="secret")
+        read = User.from_storage(user.to_dict(fs=True))
+        self.assertEqual(read.password, user.password)
+
     def test_first_name_attr(self):
         """Test that User has attr first_name, and it's an empty string"""
         user = User()
@@ -18,6 +18,12 @@ def filters():
                            amenities=amenities)
 
 
+@app.before_request
+def read_from_replicas():
+    """lets the pages read from a read replica"""
+    storage.read_from_replicas()
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""
@@ -16,6 +16,12 @@ def states_list():
     return render_template('7-states_list.html', states=states)
 
 
+@app.before_request
+def read_from_replicas():
+    """lets the pages read from a read replica"""
+    storage.read_from_replicas()
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""
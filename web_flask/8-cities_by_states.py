@@ -16,6 +16,12 @@ def cities_by_states():
     return render_template('8-cities_by_states.html', states=states)
 
 
+@app.before_request
+def read_from_replicas():
+    """lets the pages read from a read replica"""
+    storage.read_from_replicas()
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""
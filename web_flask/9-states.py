@@ -19,6 +19,12 @@ def states(state_id=None):
     return render_template('9-states.html', states=states, state_id=state_id)
 
 
+@app.before_request
+def read_from_replicas():
+    """lets the pages read from a read replica"""
+    storage.read_from_replicas()
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""